@@ -9,5 +9,9 @@ done
 python manage.py migrate --noinput
 # Collect static files
 python manage.py collectstatic --noinput
+# Warm the cache in the background so the first users skip cold-cache latency
+if [ "${WARM_CACHE_ON_START:-0}" = "1" ]; then
+  python manage.py warm_cache &
+fi
 # Execute the command (e.g., gunicorn)
 exec "$@"
\ No newline at end of file
@@ -3,4 +3,57 @@
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
 CACHE_TIMEOUT = 60 * 15  # 15 minutes
 PAGE_SIZE = 20
-GENRE_CACHE_TIMEOUT = 60 * 60 * 24  # 24 hours
\ No newline at end of file
+GENRE_CACHE_TIMEOUT = 60 * 60 * 24  # 24 hours
+SYNC_QUEUE_KEY = "tmdb_sync_queue"
+SYNC_JOB_DEDUPE_TIMEOUT = 60 * 5  # 5 minutes
+SYNC_INTERVAL = 60 * 15  # 15 minutes
+SYNC_PAGES = 5
+TMDB_CONNECT_TIMEOUT = 3.05  # seconds
+TMDB_READ_TIMEOUT = 10  # seconds
+TMDB_POOL_SIZE = 20
+TMDB_MAX_RETRIES = 3
+TMDB_BACKOFF_FACTOR = 0.5
+TMDB_CIRCUIT_FAILURE_THRESHOLD = 5
+TMDB_CIRCUIT_RESET_TIMEOUT = 30  # seconds
+GENRE_CACHE_KEY = "tmdb_genre_map"
+GENRE_LOCAL_CACHE_TIMEOUT = 60 * 5  # 5 minutes
+TMDB_RATE_LIMIT = 40  # requests per second
+TMDB_MAX_PAGE = 500
+REC_LIMIT = 10
+REC_POOL_SIZE = 500
+REC_POOL_TIMEOUT = 60 * 60  # 1 hour
+REC_USER_PROFILE_TIMEOUT = 60 * 60 * 24  # 24 hours
+REC_SAMPLE_SIZE = 200
+REC_MAX_GENRES = 5
+REC_NEIGHBORS = 20
+REC_MODES = ("genre", "item")
+REC_RESULT_TIMEOUT = 60 * 60  # 1 hour
+REC_LOCK_TIMEOUT = 30  # seconds
+REC_MAX_RESULTS = 100
+MOVIES_CACHE_NAMESPACE = "movies"
+API_VERSION = "v1"
+SERIALIZER_VERSION = 1  # bump when serializer output changes
+PUBSUB_CHANNEL = "movieapp_events"
+CACHE_LOCAL_TIMEOUT = 30  # seconds
+CACHE_LOCAL_MAX_ENTRIES = 1000
+CACHE_FILL_WAIT = 5  # seconds
+CACHE_COMPRESS_MIN_BYTES = 1024
+CACHE_STALE_WINDOW = 60 * 5  # 5 minutes
+CACHE_XFETCH_BETA = 1.0
+CACHE_REFRESH_LOCK_TIMEOUT = 30  # seconds
+WARM_PAGES = 5
+WARM_TOP_MOVIES = 100
+WARM_ACTIVE_DAYS = 7
+WARM_MAX_USERS = 500
+WARM_CONCURRENCY = 8
+ESTIMATED_COUNT_MIN = 10000
+SEARCH_CONFIG = "english"
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+TITLE_INDEX_RELOAD_INTERVAL = 60 * 60  # 1 hour
+LEADERBOARD_KEY = "movie_favorites_leaderboard"
+LEADERBOARD_META_KEY = "movie_favorites_leaderboard_meta"
+LEADERBOARD_SIZE = 1000
+LEADERBOARD_LIMIT = 10
+LEADERBOARD_MAX_LIMIT = 100
+BULK_FAVORITES_MAX = 100
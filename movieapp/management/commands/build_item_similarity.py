@@ -0,0 +1,20 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from movieapp.constants import REC_NEIGHBORS
+from movieapp.utils.item_similarity import build_item_neighbors
+
+class Command(BaseCommand):
+    help = "Rebuilds the item-item similarity table from favorite co-occurrence"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=REC_NEIGHBORS,
+                            help='Number of neighbours to keep per movie')
+
+    def handle(self, *args, **options):
+        if options['top_k'] < 1:
+            raise CommandError("--top-k must be positive")
+        started = time.monotonic()
+        count = build_item_neighbors(top_k=options['top_k'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {count} item neighbours in {time.monotonic() - started:.1f}s"
+        ))
@@ -1,6 +1,10 @@
 from django.core.management.base import BaseCommand
 from movieapp.models import Genre, Movie, FavoriteMovie
 from django.contrib.auth import get_user_model
+from movieapp.utils.recommendation_engine import reset_user_recommendations
+from movieapp.utils.item_similarity import build_item_neighbors
+from movieapp.utils.search import update_search_vectors
+from movieapp.utils.leaderboard import reconcile_favorite_counts
 from faker import Faker
 import random
 
@@ -43,6 +47,7 @@ class Command(BaseCommand):
               ) for _ in range(100)
           ]
           movies = Movie.objects.bulk_create(movies_data)
+          update_search_vectors([movie.id for movie in movies])
           for movie in movies:
               movie.genres.set(random.sample(genres, random.randint(1, 3)))
 
@@ -59,4 +64,10 @@ class Command(BaseCommand):
           ]
           FavoriteMovie.objects.bulk_create(favorite_data)
 
+          # bulk_create skips the view hooks, so rebuild the recommendation indexes and favorite counts once here
+          build_item_neighbors()
+          for user in users:
+              reset_user_recommendations(user.id)
+          reconcile_favorite_counts()
+
           self.stdout.write(self.style.SUCCESS("Database seeded with 2 users, 20 genres, 100 movies, and 200 unique favorite entries"))
\ No newline at end of file
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from movieapp.constants import TMDB_RATE_LIMIT, TMDB_MAX_PAGE
+from movieapp.utils.genre_cache import get_genre_map
+from movieapp.utils.sync_utils import upsert_tmdb_movies
+from movieapp.utils.tmdb_utils import TMDBUtils
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Asyncio token bucket limiting the rate of outbound TMDB requests."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def parse_pages(value):
+    """Parse a page range such as '1-500' or a single page such as '7'."""
+    try:
+        if '-' in value:
+            start, end = (int(part) for part in value.split('-', 1))
+        else:
+            start = end = int(value)
+    except ValueError:
+        raise CommandError(f"Invalid page range: {value}")
+    if start < 1 or end < start or end > TMDB_MAX_PAGE:
+        raise CommandError(f"Page range must be within 1-{TMDB_MAX_PAGE}: {value}")
+    return range(start, end + 1)
+
+class Command(BaseCommand):
+    help = "Concurrently ingests a range of TMDB popular-movie pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', default='1-5', help="Page range to ingest, e.g. '1-500'")
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent TMDB requests')
+        parser.add_argument('--rate', type=float, default=TMDB_RATE_LIMIT,
+                            help='Maximum TMDB requests per second')
+        parser.add_argument('--checkpoint', default=None,
+                            help='JSON file recording completed pages; pages listed there are skipped')
+
+    def load_checkpoint(self, path):
+        """Return the set of pages already completed according to the checkpoint file."""
+        if path is None or not path.exists():
+            return set()
+        return set(json.loads(path.read_text()).get('completed_pages', []))
+
+    def save_checkpoint(self, path, completed):
+        """Persist completed pages so an interrupted run can resume."""
+        if path is not None:
+            path.write_text(json.dumps({'completed_pages': sorted(completed)}))
+
+    async def ingest(self, pages, concurrency, rate, checkpoint):
+        """Fetch pages concurrently and stream them into the bulk upsert path."""
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+        bucket = TokenBucket(rate)
+        queue = asyncio.Queue(maxsize=concurrency * 2)
+        completed = self.load_checkpoint(checkpoint)
+        pending = iter([page for page in pages if page not in completed])
+        stats = {'pages': 0, 'rows': 0, 'failed': 0}
+
+        async def fetch():
+            for page in pending:
+                await bucket.acquire()
+                data = await asyncio.to_thread(TMDBUtils.get_popular_movies, page)
+                await queue.put((page, data.get('results', [])))
+
+        async def write():
+            genre_map = await sync_to_async(get_genre_map)()
+            upsert = sync_to_async(upsert_tmdb_movies)
+            save = sync_to_async(self.save_checkpoint)
+            while (item := await queue.get()) is not None:
+                page, results = item
+                try:
+                    if not results:
+                        raise ValueError("empty TMDB response")
+                    movie_ids = await upsert(results, genre_map)
+                except Exception as e:
+                    stats['failed'] += 1
+                    logger.error(f"Failed to ingest TMDB page {page}: {str(e)}")
+                    continue
+                stats['pages'] += 1
+                stats['rows'] += len(movie_ids)
+                completed.add(page)
+                await save(checkpoint, completed)
+
+        writer = asyncio.create_task(write())
+        fetchers = asyncio.gather(*(fetch() for _ in range(concurrency)))
+        await asyncio.wait([writer, fetchers], return_when=asyncio.FIRST_COMPLETED)
+        if writer.done():
+            # The writer only stops before the end marker when it failed (e.g. the genre
+            # map could not be loaded); the fetchers would otherwise block on the full queue.
+            fetchers.cancel()
+            await asyncio.gather(fetchers, return_exceptions=True)
+            await writer
+        await fetchers
+        await queue.put(None)
+        await writer
+        return stats
+
+    def handle(self, *args, **options):
+        pages = parse_pages(options['pages'])
+        if options['concurrency'] < 1 or options['rate'] <= 0:
+            raise CommandError("--concurrency and --rate must be positive")
+        checkpoint = Path(options['checkpoint']) if options['checkpoint'] else None
+
+        started = time.monotonic()
+        try:
+            stats = asyncio.run(self.ingest(pages, options['concurrency'], options['rate'], checkpoint))
+        except Exception as e:
+            raise CommandError(f"TMDB ingest failed: {str(e)}") from e
+        elapsed = max(time.monotonic() - started, 1e-6)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Ingested {stats['pages']} pages ({stats['rows']} new or changed movies, {stats['failed']} failed) "
+            f"in {elapsed:.1f}s: {stats['pages'] / elapsed:.2f} pages/sec, {stats['rows'] / elapsed:.1f} rows/sec"
+        ))
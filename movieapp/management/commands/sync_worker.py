@@ -0,0 +1,59 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from movieapp.constants import SYNC_INTERVAL, SYNC_PAGES, GENRE_CACHE_TIMEOUT
+from movieapp.utils.sync_queue import enqueue_sync_job, dequeue_sync_job, run_sync_job
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = "Runs the background TMDB sync worker that keeps movies and genres fresh"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=SYNC_PAGES,
+                            help='Number of popular-movie pages to refresh on each schedule tick')
+        parser.add_argument('--interval', type=int, default=SYNC_INTERVAL,
+                            help='Seconds between scheduled refreshes')
+        parser.add_argument('--once', action='store_true',
+                            help='Schedule one refresh, drain the queue and exit')
+
+    def schedule(self, pages):
+        """Queue the periodic refresh jobs."""
+        for page in range(1, pages + 1):
+            enqueue_sync_job('sync_page', page=page)
+        enqueue_sync_job('reconcile_favorite_counts')
+        enqueue_sync_job('rebuild_rec_pools')
+
+    def handle(self, *args, **options):
+        pages = options['pages']
+        interval = options['interval']
+        next_run = 0
+        next_genre_refresh = 0
+        self.stdout.write(f"Sync worker started (pages={pages}, interval={interval}s)")
+
+        while True:
+            if time.monotonic() >= next_genre_refresh:
+                # Refresh well before the 24h Redis entry expires.
+                enqueue_sync_job('refresh_genres')
+                next_genre_refresh = time.monotonic() + GENRE_CACHE_TIMEOUT / 2
+            if time.monotonic() >= next_run:
+                self.schedule(pages)
+                next_run = time.monotonic() + interval
+
+            try:
+                job = dequeue_sync_job(timeout=5)
+            except Exception as e:
+                logger.error(f"Sync queue unavailable: {str(e)}")
+                time.sleep(5)
+                continue
+
+            if job is None:
+                if options['once']:
+                    break
+                continue
+
+            close_old_connections()
+            run_sync_job(job)
+
+        self.stdout.write(self.style.SUCCESS("Sync worker finished"))
@@ -0,0 +1,95 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+from movieapp.constants import (
+    REC_MODES, WARM_PAGES, WARM_TOP_MOVIES, WARM_ACTIVE_DAYS, WARM_MAX_USERS, WARM_CONCURRENCY,
+)
+from movieapp.models import FavoriteMovie, Movie, User
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = "Pre-renders hot movie pages, popular movie details and active users' recommendations into the cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=WARM_PAGES,
+                            help='Number of movie list pages to warm')
+        parser.add_argument('--top', type=int, default=WARM_TOP_MOVIES,
+                            help='Number of most-favorited movie details to warm')
+        parser.add_argument('--active-days', type=int, default=WARM_ACTIVE_DAYS,
+                            help='Warm recommendations for users who added a favorite within this many days')
+        parser.add_argument('--users', type=int, default=WARM_MAX_USERS,
+                            help='Maximum number of users to warm recommendations for')
+        parser.add_argument('--concurrency', type=int, default=WARM_CONCURRENCY,
+                            help='Maximum number of requests rendered in parallel')
+        parser.add_argument('--host', default=settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'localhost',
+                            help='Host header used for the warm-up requests; must be in ALLOWED_HOSTS')
+
+    def get_targets(self, options):
+        """Build the (path, user) pairs to request; user is None for public endpoints."""
+        targets = [('/api/movies/', None)]
+        targets += [(f'/api/movies/?page={page}', None) for page in range(1, options['pages'] + 1)]
+
+        top_movies = (
+            Movie.objects.filter(favorite_count__gt=0)
+            .order_by('-favorite_count', 'id')
+            .values_list('id', flat=True)[:options['top']]
+        )
+        targets += [(f'/api/movies/{movie_id}/', None) for movie_id in top_movies]
+
+        since = timezone.now() - timedelta(days=options['active_days'])
+        user_ids = (
+            FavoriteMovie.objects.filter(added_at__gte=since)
+            .values_list('user_id', flat=True)
+            .distinct()[:options['users']]
+        )
+        for user in User.objects.filter(id__in=list(user_ids), is_active=True):
+            # Clients usually omit ?mode=, which is cached under its own fingerprint.
+            targets.append(('/api/recommendations/', user))
+            targets += [(f'/api/recommendations/?mode={mode}', user) for mode in REC_MODES]
+        return targets
+
+    def warm(self, path, user, host):
+        """Request one path through the full view stack so it lands in the cache."""
+        client = APIClient(HTTP_HOST=host)
+        if user is not None:
+            client.force_authenticate(user)
+        try:
+            return client.get(path).status_code
+        finally:
+            connection.close()
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency must be positive")
+        started = time.monotonic()
+        targets = self.get_targets(options)
+        warmed = failed = 0
+
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            futures = {executor.submit(self.warm, path, user, options['host']): path for path, user in targets}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    status = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to warm {path}: {str(e)}")
+                    failed += 1
+                    continue
+                if status == 200:
+                    warmed += 1
+                else:
+                    logger.warning(f"Warming {path} returned HTTP {status}")
+                    failed += 1
+
+        elapsed = time.monotonic() - started
+        logger.info(f"Cache warm-up finished: {warmed} warmed, {failed} failed in {elapsed:.1f}s")
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed {warmed} of {len(targets)} responses in {elapsed:.1f}s ({failed} failed)"
+        ))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movieapp', '0003_alter_favoritemovie_added_at_alter_genre_name_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieNeighbor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('co_count', models.IntegerField(default=0)),
+                ('score', models.FloatField()),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbors', to='movieapp.movie')),
+                ('neighbor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movieapp.movie')),
+            ],
+            options={
+                'unique_together': {('movie', 'neighbor')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movieapp', '0004_movieneighbor'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='favoritemovie',
+            index=models.Index(fields=['user', '-added_at', '-id'], name='favorite_user_added_idx'),
+        ),
+    ]
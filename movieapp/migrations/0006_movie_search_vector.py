@@ -0,0 +1,57 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:35
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_INDEXES = [
+    django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='movie_search_vector_idx'),
+    django.contrib.postgres.indexes.GinIndex(fields=['title'], name='movie_title_trgm_idx', opclasses=['gin_trgm_ops']),
+]
+
+
+def add_search_indexes(apps, schema_editor):
+    # GIN indexes and tsvector columns only exist on PostgreSQL; other databases use SearchFilter.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Movie = apps.get_model('movieapp', 'Movie')
+    for index in SEARCH_INDEXES:
+        schema_editor.add_index(Movie, index)
+    Movie.objects.update(search_vector=(
+        django.contrib.postgres.search.SearchVector('title', weight='A', config='english')
+        + django.contrib.postgres.search.SearchVector('description', weight='B', config='english')
+    ))
+
+
+def create_trigram_extension(apps, schema_editor):
+    # TrigramExtension's reverse step queries pg_extension even on other databases.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Movie = apps.get_model('movieapp', 'Movie')
+    for index in SEARCH_INDEXES:
+        schema_editor.remove_index(Movie, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movieapp', '0005_favoritemovie_user_added_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_extension, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='movie',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # Database-only: keeping these indexes out of the model state stops SQLite from
+        # trying to recreate them whenever it rebuilds the movie table.
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
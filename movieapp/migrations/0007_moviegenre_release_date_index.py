@@ -0,0 +1,66 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+NEWEST_INDEX = models.Index(
+    models.OrderBy(models.F('release_date'), descending=True, nulls_last=True),
+    models.OrderBy(models.F('id'), descending=True),
+    name='movie_newest_idx',
+)
+
+
+def add_newest_index(apps, schema_editor):
+    # Matches the "newest" sort exactly; SQLite cannot index NULLS LAST, so it only gets the plain index.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.add_index(apps.get_model('movieapp', 'Movie'), NEWEST_INDEX)
+
+
+def remove_newest_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_index(apps.get_model('movieapp', 'Movie'), NEWEST_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movieapp', '0006_movie_search_vector'),
+    ]
+
+    operations = [
+        # The table already exists as the auto-created through table of Movie.genres;
+        # only Django's view of it changes, so no data is copied.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='MovieGenre',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='movieapp.genre')),
+                        ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='movieapp.movie')),
+                    ],
+                    options={
+                        'db_table': 'movieapp_movie_genres',
+                        'unique_together': {('movie', 'genre')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='movie',
+                    name='genres',
+                    field=models.ManyToManyField(related_name='movies', through='movieapp.MovieGenre', to='movieapp.genre'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='moviegenre',
+            index=models.Index(fields=['genre', 'movie'], name='movie_genre_genre_movie_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['release_date', 'id'], name='movie_release_date_idx'),
+        ),
+        # Database-only, like the search indexes in 0006.
+        migrations.RunPython(add_newest_index, remove_newest_index),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:39
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_favorite_counts(apps, schema_editor):
+    Movie = apps.get_model('movieapp', 'Movie')
+    FavoriteMovie = apps.get_model('movieapp', 'FavoriteMovie')
+    counts = (
+        FavoriteMovie.objects.filter(movie=OuterRef('pk'))
+        .order_by().values('movie').annotate(count=Count('id')).values('count')
+    )
+    Movie.objects.update(favorite_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movieapp', '0007_moviegenre_release_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='favorite_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_favorite_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['-favorite_count', 'id'], name='movie_favorite_count_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 # movieapp/models.py
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 class User(AbstractUser):
@@ -25,14 +26,38 @@ class Movie(models.Model):
     title = models.CharField(max_length=200, db_index=True)
     description = models.TextField()
     release_date = models.DateField(null=True, blank=True)
-    genres = models.ManyToManyField(Genre, related_name="movies")
+    genres = models.ManyToManyField(Genre, related_name="movies", through="MovieGenre")
     tmdb_id = models.IntegerField(unique=True, db_index=True)
     poster_path = models.URLField(max_length=500, blank=True, null=True)
+    favorite_count = models.PositiveIntegerField(default=0)  # Denormalized FavoriteMovie count, see utils.leaderboard
+    search_vector = SearchVectorField(null=True, editable=False)  # Maintained by utils.search, PostgreSQL only
+
+    class Meta:
+        # The GIN full-text and trigram indexes (0006) and the "newest" sort index (0007) are
+        # PostgreSQL-only and created outside the model state, so SQLite table rebuilds never see them.
+        indexes = [
+            models.Index(fields=["release_date", "id"], name="movie_release_date_idx"),
+            models.Index(fields=["-favorite_count", "id"], name="movie_favorite_count_idx"),
+        ]
 
     def __str__(self):
         """Return the movie title as string representation."""
         return self.title
 
+class MovieGenre(models.Model):
+    """Model linking a movie to one of its genres."""
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE)
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = "movieapp_movie_genres"  # Table created for the former auto-generated through model
+        unique_together = ("movie", "genre")
+        indexes = [models.Index(fields=["genre", "movie"], name="movie_genre_genre_movie_idx")]
+
+    def __str__(self):
+        """Return string representation of movie and genre."""
+        return f"{self.movie_id} - {self.genre_id}"
+
 class FavoriteMovie(models.Model):
     """Model representing a user's favorite movie."""
     user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=True)
@@ -41,7 +66,22 @@ class FavoriteMovie(models.Model):
 
     class Meta:
         unique_together = ("user", "movie")
+        indexes = [models.Index(fields=["user", "-added_at", "-id"], name="favorite_user_added_idx")]
 
     def __str__(self):
         """Return string representation of user and movie."""
-        return f"{self.user.username} - {self.movie.title}"
\ No newline at end of file
+        return f"{self.user.username} - {self.movie.title}"
+
+class MovieNeighbor(models.Model):
+    """Model representing a precomputed item-item similarity between two movies."""
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name="neighbors")
+    neighbor = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name="+")
+    co_count = models.IntegerField(default=0)
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = ("movie", "neighbor")
+
+    def __str__(self):
+        """Return string representation of the movie pair and score."""
+        return f"{self.movie_id} -> {self.neighbor_id} ({self.score:.3f})"
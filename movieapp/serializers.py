@@ -3,6 +3,7 @@ from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from drf_spectacular.utils import extend_schema_field
 from movieapp.models import User, Genre, Movie, FavoriteMovie
+from movieapp.constants import BULK_FAVORITES_MAX
 
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for User model with favorite movies."""
@@ -109,4 +110,13 @@ class FavoriteMovieSerializer(serializers.ModelSerializer):
         movie = validated_data['movie']
         if FavoriteMovie.objects.filter(user=user, movie=movie).exists():
             raise ValidationError({"non_field_errors": ["This movie is already in your favorites."]})
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+class FavoriteMovieBulkSerializer(serializers.Serializer):
+    """Serializer for adding or removing several favorite movies at once."""
+    movie_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_FAVORITES_MAX,
+        help_text='IDs of the movies to add to or remove from favorites',
+    )
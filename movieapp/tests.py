@@ -1,3 +1,629 @@
-from django.test import TestCase
+import datetime
+import gzip
+import io
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from movieapp.constants import (
+    CACHE_TIMEOUT, MOVIES_CACHE_NAMESPACE, REC_NEIGHBORS, TITLE_INDEX_RELOAD_INTERVAL,
+    TMDB_CIRCUIT_FAILURE_THRESHOLD, TMDB_MAX_RETRIES,
+)
+from movieapp.models import FavoriteMovie, Genre, Movie, MovieNeighbor, User
+from movieapp.utils import tmdb_utils
+from movieapp.utils.cache_utils import bump_cache_generation, get_cache_generation
+from movieapp.utils.fast_serializers import movie_values
+from movieapp.utils.item_similarity import build_item_neighbors
+from movieapp.utils.movie_filters import MovieFilter
+from movieapp.utils.search import update_search_vectors
+from movieapp.utils.sync_utils import upsert_tmdb_movies
+from movieapp.utils.recommendation_engine import (
+    apply_favorite_changes, build_genre_pools, get_recommendation_version, get_user_profile,
+)
+from movieapp.utils.title_index import TitleIndex, title_index
+from movieapp.utils.tiered_cache import TieredCache, tiered_cache
+from movieapp.utils.tmdb_utils import CircuitBreaker, TMDBUtils
+from movieapp.views.movie_views import MovieViewSet
 
-# Create your tests here.
+def clear_caches():
+    """Empty Redis (or the configured cache) and this process's L1 tier."""
+    tiered_cache.clear()
+
+def create_movies(count, genre_ids=(28,), genres_per_movie=1, description=''):
+    """Create movies "Movie 1".."Movie <count>" (tmdb_id = index), cycling them through the genres.
+
+    Movie i gets genres_per_movie consecutive genres of genre_ids, starting at
+    position i modulo len(genre_ids).
+
+    Returns:
+        list: The created movies, in index order.
+    """
+    genres = [Genre.objects.get_or_create(id=genre_id, defaults={'name': f"Genre {genre_id}"})[0] for genre_id in genre_ids]
+    movies = Movie.objects.bulk_create([
+        Movie(title=f"Movie {index}", description=description, tmdb_id=index) for index in range(1, count + 1)
+    ])
+    if genres:
+        Movie.genres.through.objects.bulk_create([
+            Movie.genres.through(movie=movie, genre=genres[(position + offset) % len(genres)])
+            for position, movie in enumerate(movies)
+            for offset in range(genres_per_movie)
+        ])
+    return movies
+
+class StubTMDBHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the TMDB API, scripted per test through the server attributes."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.calls += 1
+            status = server.statuses.pop(0) if server.statuses else server.default_status
+        time.sleep(server.delay)
+        body = json.dumps({'page': 1, 'results': [{'id': 1, 'title': 'Stub'}]}).encode()
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client already gave up on its read timeout.
+
+    def log_message(self, *args):
+        pass
+
+class TMDBClientTests(SimpleTestCase):
+    """TMDB session timeouts, retries and circuit breaker against a local stub server."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubTMDBHandler)
+        cls.server.lock = threading.Lock()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.calls = 0
+        self.server.statuses = []
+        self.server.default_status = 200
+        self.server.delay = 0
+        self.breaker = CircuitBreaker(TMDB_CIRCUIT_FAILURE_THRESHOLD, reset_timeout=30)
+        patches = [
+            mock.patch.object(TMDBUtils, 'BASE_URL', f"http://127.0.0.1:{self.server.server_port}/3"),
+            mock.patch.object(TMDBUtils, 'TIMEOUT', (1, 0.2)),
+            mock.patch.object(tmdb_utils, 'TMDB_BACKOFF_FACTOR', 0),
+            mock.patch.object(tmdb_utils, 'circuit_breaker', self.breaker),
+            # Force a fresh session so the patched retry policy is mounted.
+            mock.patch.object(tmdb_utils, '_session', None),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_success(self):
+        self.assertEqual(TMDBUtils.get_popular_movies(1)['results'][0]['title'], 'Stub')
+        self.assertEqual(self.server.calls, 1)
+
+    def test_read_timeout_is_retried_then_reported(self):
+        self.server.delay = 0.5
+        self.assertEqual(TMDBUtils.get_popular_movies(1), {'results': []})
+        self.assertEqual(self.server.calls, TMDB_MAX_RETRIES + 1)
+        self.assertEqual(self.breaker.failures, 1)
+
+    def test_retries_on_429_and_5xx(self):
+        self.server.statuses = [429, 502, 503]
+        self.assertEqual(TMDBUtils.get_popular_movies(1)['results'][0]['id'], 1)
+        self.assertEqual(self.server.calls, 4)
+        self.assertEqual(self.breaker.failures, 0)
+
+    def test_client_errors_are_not_retried(self):
+        self.server.statuses = [404]
+        self.assertEqual(TMDBUtils.get_movie_details(1), {})
+        self.assertEqual(self.server.calls, 1)
+        self.assertEqual(self.breaker.failures, 0)
+
+    def test_circuit_opens_after_threshold(self):
+        self.server.default_status = 503
+        for _ in range(TMDB_CIRCUIT_FAILURE_THRESHOLD):
+            TMDBUtils.get_popular_movies(1)
+        self.assertIsNotNone(self.breaker.opened_at)
+
+        calls = self.server.calls
+        self.assertEqual(TMDBUtils.get_popular_movies(1), {'results': []})
+        self.assertEqual(self.server.calls, calls)
+
+    def test_half_open_success_closes_circuit(self):
+        self.server.default_status = 503
+        for _ in range(TMDB_CIRCUIT_FAILURE_THRESHOLD):
+            TMDBUtils.get_popular_movies(1)
+        self.breaker.opened_at -= self.breaker.reset_timeout
+
+        self.server.default_status = 200
+        self.assertEqual(TMDBUtils.get_popular_movies(1)['results'][0]['id'], 1)
+        self.assertIsNone(self.breaker.opened_at)
+        self.assertEqual(self.breaker.failures, 0)
+
+    def test_half_open_failure_reopens_circuit(self):
+        self.server.default_status = 503
+        for _ in range(TMDB_CIRCUIT_FAILURE_THRESHOLD):
+            TMDBUtils.get_popular_movies(1)
+        self.breaker.opened_at -= self.breaker.reset_timeout
+
+        calls = self.server.calls
+        TMDBUtils.get_popular_movies(1)
+        self.assertGreater(self.server.calls, calls)
+        self.assertFalse(self.breaker.allow_request())
+
+class ItemNeighborUpdateTests(TestCase):
+    """Incremental MovieNeighbor updates stay exact and bounded by REC_NEIGHBORS."""
+
+    def setUp(self):
+        clear_caches()
+        self.movies = create_movies(REC_NEIGHBORS + 10, genre_ids=())
+
+    def favorite(self, username, movies):
+        user = User.objects.create(username=username, email=f"{username}@example.com")
+        FavoriteMovie.objects.bulk_create([FavoriteMovie(user=user, movie=movie) for movie in movies])
+        apply_favorite_changes(user.id, added=[movie.id for movie in movies])
+        return user
+
+    def test_counts_are_exact_after_trimmed_rebuild(self):
+        shared = self.movies[:4]
+        for username in ('first', 'second'):
+            user = User.objects.create(username=username, email=f"{username}@example.com")
+            FavoriteMovie.objects.bulk_create([FavoriteMovie(user=user, movie=movie) for movie in shared])
+        build_item_neighbors(top_k=1)
+
+        self.favorite('third', shared)
+        rows = MovieNeighbor.objects.filter(movie__in=shared)
+        self.assertEqual(rows.count(), 12)
+        self.assertEqual(set(rows.values_list('co_count', flat=True)), {3})
+
+    def test_removal_recounts_and_deletes_empty_pairs(self):
+        self.favorite('first', self.movies[:3])
+        user = self.favorite('second', self.movies[:3])
+        FavoriteMovie.objects.filter(user=user, movie=self.movies[0]).delete()
+        apply_favorite_changes(user.id, removed=[self.movies[0].id])
+
+        self.assertEqual(MovieNeighbor.objects.get(movie=self.movies[0], neighbor=self.movies[1]).co_count, 1)
+        self.assertEqual(MovieNeighbor.objects.get(movie=self.movies[1], neighbor=self.movies[2]).co_count, 2)
+        FavoriteMovie.objects.filter(movie=self.movies[0]).delete()
+        apply_favorite_changes(user.id, removed=[self.movies[0].id])
+        self.assertFalse(MovieNeighbor.objects.filter(movie=self.movies[0]).exists())
+
+    def test_neighbors_are_trimmed_to_k(self):
+        self.favorite('first', self.movies)
+        self.favorite('second', self.movies[:5])
+        for movie in self.movies:
+            self.assertLessEqual(MovieNeighbor.objects.filter(movie=movie).count(), REC_NEIGHBORS)
+        self.assertEqual(
+            MovieNeighbor.objects.filter(movie=self.movies[0], neighbor__in=self.movies[1:5], co_count=2).count(), 4
+        )
+
+    def test_profile_is_rebuilt_after_a_change(self):
+        user = self.favorite('first', self.movies[:1])
+        self.assertEqual(get_user_profile(user.id)['favorites'], {self.movies[0].id})
+        FavoriteMovie.objects.create(user=user, movie=self.movies[1])
+        apply_favorite_changes(user.id, added=[self.movies[1].id])
+        self.assertEqual(get_user_profile(user.id)['favorites'], {self.movies[0].id, self.movies[1].id})
+
+class StaleRecommendationTests(TestCase):
+    """A stale recommendation list served during a rebuild is not cached as the new version."""
+
+    def setUp(self):
+        clear_caches()
+        movies = create_movies(5)
+        self.user = User.objects.create(username='viewer', email='viewer@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.post('/api/favorite-movies/', {'movie_id': movies[0].id})
+        self.movies = movies
+
+    def test_stale_result_is_not_cached(self):
+        self.assertEqual(len(self.client.get('/api/recommendations/').json()['results']), 4)
+        self.client.post('/api/favorite-movies/', {'movie_id': self.movies[1].id})
+        version = get_recommendation_version(self.user.id)
+        result_key = f"rec_result_{self.user.id}_genre_v{version}"
+
+        # Another request is rebuilding this version: the previous list is served as is.
+        cache.add(f"{result_key}_lock", 1)
+        self.assertEqual(len(self.client.get('/api/recommendations/').json()['results']), 4)
+        self.assertIsNone(cache.get(result_key))
+
+        cache.delete(f"{result_key}_lock")
+        self.assertEqual(len(self.client.get('/api/recommendations/').json()['results']), 3)
+        self.assertIsNotNone(cache.get(result_key))
+
+class WarmCacheTests(TransactionTestCase):
+    """warm_cache fills the entries clients actually request.
+
+    A TransactionTestCase, so the command's worker threads see the committed rows.
+    """
+
+    def setUp(self):
+        clear_caches()
+        movies = create_movies(5)
+        self.user = User.objects.create(username='viewer', email='viewer@example.com')
+        FavoriteMovie.objects.create(user=self.user, movie=movies[0])
+
+    def test_default_recommendations_url_is_warmed(self):
+        call_command('warm_cache', '--host', 'testserver', stdout=io.StringIO())
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get('/api/recommendations/').status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get('/api/movies/').status_code, 200)
+
+class QueryCountTests(TestCase):
+    """Database round trips per endpoint, so list paths don't regress to extra counts and exists()."""
+
+    def setUp(self):
+        clear_caches()
+        self.movies = create_movies(50, genre_ids=(28, 12, 35), genres_per_movie=2)
+        self.user = User.objects.create(username='viewer', email='viewer@example.com')
+        FavoriteMovie.objects.bulk_create([FavoriteMovie(user=self.user, movie=movie) for movie in self.movies[:25]])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertQueries(self, count, path, status=200, **params):
+        with self.assertNumQueries(count):
+            response = self.client.get(path, params)
+        self.assertEqual(response.status_code, status)
+        return response
+
+    def test_movie_list(self):
+        # One count, the page and its genres.
+        self.assertQueries(3, '/api/movies/')
+        self.assertQueries(3, '/api/movies/', page=2)
+        self.assertQueries(3, '/api/movies/', genre='28', sort='newest')
+
+    def test_movie_search(self):
+        self.assertQueries(3, '/api/movies/', search='movie 1')
+
+    def test_movie_list_cursor(self):
+        # No count: the page (one row extra to detect the next page) and its genres.
+        response = self.assertQueries(2, '/api/movies/', pagination='cursor')
+        self.assertQueries(2, response.json()['next'])
+
+    def test_cache_hits(self):
+        for path in ('/api/movies/', '/api/favorite-movies/', f"/api/movies/{self.movies[0].id}/", '/api/recommendations/'):
+            self.client.get(path)
+            self.assertQueries(0, path)
+
+    def test_movie_detail(self):
+        # The movie and its genres, and no TMDB call.
+        with mock.patch.object(TMDBUtils, 'get_movie_details') as get_movie_details:
+            self.assertQueries(2, f"/api/movies/{self.movies[0].id}/")
+        get_movie_details.assert_not_called()
+
+    def test_favorite_list(self):
+        self.assertQueries(3, '/api/favorite-movies/')
+        response = self.assertQueries(2, '/api/favorite-movies/', pagination='cursor')
+        self.assertQueries(2, response.json()['next'])
+
+    def test_recommendations(self):
+        # Cold: the user profile (2), a pool per favorite genre plus the pools' genres (3 + 1)
+        # and the page of movies with their genres (2).
+        response = self.assertQueries(8, '/api/recommendations/')
+        # The ranked list is cached per version, so later pages only load their movies.
+        self.assertQueries(2, response.json()['next'])
+
+    def test_recommendations_with_warm_pools(self):
+        build_genre_pools()
+        self.assertQueries(4, '/api/recommendations/')
+
+    def test_autocomplete(self):
+        title_index.load()
+        response = self.assertQueries(0, '/api/movies/autocomplete/', q='movie 1')
+        self.assertEqual(len(response.json()), 10)
+
+    def test_leaderboard(self):
+        entries = [{'id': 1, 'title': 'Movie 1', 'poster_path': None, 'favorite_count': 1}]
+        with mock.patch('movieapp.views.movie_views.get_leaderboard', return_value=entries):
+            self.assertQueries(0, '/api/movies/leaderboard/')
+
+    def test_leaderboard_survives_redis_errors(self):
+        with mock.patch('movieapp.utils.leaderboard.get_redis_connection', side_effect=ConnectionError("down")):
+            response = self.assertQueries(0, '/api/movies/leaderboard/')
+        self.assertEqual(response.json(), [])
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "full-text and trigram search need PostgreSQL")
+class PostgresSearchTests(TestCase):
+    """Full-text search, its trigram fallback, and indexing of movies written through the API."""
+
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create(username='editor', email='editor@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        movies = Movie.objects.bulk_create([
+            Movie(title=title, description='A film.', tmdb_id=tmdb_id)
+            for tmdb_id, title in ((1, 'Inception'), (2, 'The Dark Knight'))
+        ])
+        update_search_vectors([movie.id for movie in movies])
+
+    def search(self, terms):
+        return [movie['title'] for movie in self.client.get('/api/movies/', {'search': terms}).json()['results']]
+
+    def test_full_text_search(self):
+        self.assertEqual(self.search('knight'), ['The Dark Knight'])
+
+    def test_updated_movies_are_reindexed(self):
+        movie = Movie.objects.get(tmdb_id=1)
+        self.assertEqual(self.search('inception'), ['Inception'])
+        self.client.patch(f"/api/movies/{movie.id}/", {'title': 'Interstellar'})
+        self.assertEqual(self.search('inception'), [])
+        self.assertEqual(self.search('interstellar'), ['Interstellar'])
+
+    def test_trigram_fallback_only_without_full_text_match(self):
+        with self.assertNumQueries(4):
+            self.assertEqual(self.search('incepton'), ['Inception'])
+        with self.assertNumQueries(3):
+            self.assertEqual(self.search('inception'), ['Inception'])
+
+class MovieWriteCacheTests(TestCase):
+    """Movies written through the API are not served from stale cached lists or details."""
+
+    def setUp(self):
+        clear_caches()
+        self.movie = Movie.objects.create(title='Inception', description='A film.', tmdb_id=1)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='editor', email='editor@example.com'))
+
+    def titles(self):
+        return [movie['title'] for movie in self.client.get('/api/movies/').json()['results']]
+
+    def test_update_invalidates_list_and_detail(self):
+        detail = f"/api/movies/{self.movie.id}/"
+        self.assertEqual(self.titles(), ['Inception'])
+        self.assertEqual(self.client.get(detail).json()['title'], 'Inception')
+        self.client.patch(detail, {'title': 'Interstellar'})
+        self.assertEqual(self.titles(), ['Interstellar'])
+        self.assertEqual(self.client.get(detail).json()['title'], 'Interstellar')
+
+    def test_writes_are_broadcast_to_title_indexes(self):
+        detail = f"/api/movies/{self.movie.id}/"
+        with mock.patch('movieapp.views.movie_views.publish') as publish:
+            self.client.patch(detail, {'title': 'Interstellar'})
+            self.client.delete(detail)
+        publish.assert_has_calls([
+            mock.call('movies_synced', movies=[[self.movie.id, 'Interstellar']]),
+            mock.call('movies_deleted', movie_ids=[self.movie.id]),
+        ])
+
+    def test_delete_invalidates_list(self):
+        self.assertEqual(self.titles(), ['Inception'])
+        self.assertEqual(self.client.delete(f"/api/movies/{self.movie.id}/").status_code, 204)
+        self.assertEqual(self.titles(), [])
+
+class CachedResponseTests(TestCase):
+    """ETag revalidation, gzip variants and stale-while-revalidate of cached movie lists."""
+
+    def setUp(self):
+        clear_caches()
+        # Enough rows for the rendered page to cross CACHE_COMPRESS_MIN_BYTES.
+        create_movies(20, genre_ids=(), description='A film.' * 10)
+        self.client = APIClient()
+
+    def cache_key(self):
+        request = Request(APIRequestFactory().get('/api/movies/'))
+        return MovieViewSet().get_cache_key(request, 'movie_list', namespace=MOVIES_CACHE_NAMESPACE)
+
+    def test_matching_etag_is_not_modified_until_the_movies_change(self):
+        etag = self.client.get('/api/movies/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/movies/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        Movie.objects.filter(tmdb_id=1).update(title='Renamed')
+        bump_cache_generation(MOVIES_CACHE_NAMESPACE)
+        response = self.client.get('/api/movies/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_gzip_body_only_when_accepted(self):
+        self.client.get('/api/movies/')
+        response = self.client.get('/api/movies/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response['ETag'].endswith('-gzip"'))
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['results']), 20)
+
+        response = self.client.get('/api/movies/')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(response.json()['results']), 20)
+        # Either variant revalidates against the same stored ETag.
+        gzip_etag = self.client.get('/api/movies/', HTTP_ACCEPT_ENCODING='gzip')['ETag']
+        self.assertEqual(self.client.get('/api/movies/', HTTP_IF_NONE_MATCH=gzip_etag).status_code, 304)
+
+    def test_stale_entry_is_served_while_another_request_refreshes(self):
+        self.client.get('/api/movies/')
+        Movie.objects.filter(tmdb_id=1).update(title='Renamed')
+        cache.add(f"{self.cache_key()}_refresh", 1)
+        expired = SimpleNamespace(time=lambda: time.time() + CACHE_TIMEOUT + 1, monotonic=time.monotonic)
+        with mock.patch('movieapp.utils.cache_utils.time', expired):
+            with self.assertNumQueries(0):
+                self.assertEqual(self.client.get('/api/movies/').json()['results'][0]['title'], 'Movie 1')
+            cache.delete(f"{self.cache_key()}_refresh")
+            self.assertEqual(self.client.get('/api/movies/').json()['results'][0]['title'], 'Renamed')
+
+    def test_refresh_by_another_worker_is_not_repeated(self):
+        workers = [TieredCache(), TieredCache()]
+
+        def get(worker):
+            with mock.patch('movieapp.utils.cache_utils.tiered_cache', worker):
+                return self.client.get('/api/movies/').json()['results'][0]['title']
+
+        for worker in workers:
+            get(worker)
+        Movie.objects.filter(tmdb_id=1).update(title='Renamed')
+        expired = SimpleNamespace(time=lambda: time.time() + CACHE_TIMEOUT + 1, monotonic=time.monotonic)
+        with mock.patch('movieapp.utils.cache_utils.time', expired):
+            self.assertEqual(get(workers[0]), 'Renamed')
+            # The second worker's L1 still holds the expired entry, but Redis has the refreshed one.
+            with self.assertNumQueries(0):
+                get(workers[1])
+            with self.assertNumQueries(0):
+                self.assertEqual(get(workers[1]), 'Renamed')
+
+class CacheGenerationTests(SimpleTestCase):
+    """Generation bumps are visible to every worker without waiting for pub/sub."""
+
+    def setUp(self):
+        clear_caches()
+
+    def test_bump_by_another_worker_is_seen(self):
+        self.assertEqual(get_cache_generation('movies'), 1)
+        # Another worker's INCR, whose invalidation message never arrives here.
+        cache.incr('movies_gen')
+        self.assertEqual(get_cache_generation('movies'), 2)
+
+class TitleIndexReloadTests(SimpleTestCase):
+    """Stale title indexes reload once, in the background, while lookups keep being served."""
+
+    def test_stale_index_reloads_once_off_the_request_path(self):
+        index = TitleIndex()
+        index.update([(1, 'Inception')])
+        index._loaded_at = time.monotonic() - TITLE_INDEX_RELOAD_INTERVAL
+        reloaded = threading.Event()
+        release = threading.Event()
+
+        def slow_load():
+            release.wait(5)
+            reloaded.set()
+
+        with mock.patch.object(index, 'load', side_effect=slow_load) as load:
+            for _ in range(20):
+                index.ensure_loaded()
+                self.assertEqual(index.search('incep'), [{'id': 1, 'title': 'Inception'}])
+            release.set()
+            self.assertTrue(reloaded.wait(5))
+        self.assertEqual(load.call_count, 1)
+
+class TitleIndexUpdateTests(SimpleTestCase):
+    """Retitled and deleted movies are patched into the title index in place."""
+
+    def setUp(self):
+        self.index = TitleIndex()
+        self.index.update([(1, 'Inception'), (2, 'The Dark Knight')])
+
+    def test_retitle_replaces_old_keys(self):
+        self.index.update([(1, 'Interstellar')])
+        self.assertEqual(self.index.search('incep'), [])
+        self.assertEqual(self.index.search('inter'), [{'id': 1, 'title': 'Interstellar'}])
+        self.assertEqual(self.index.search('knight'), [{'id': 2, 'title': 'The Dark Knight'}])
+
+    def test_remove(self):
+        self.index.remove([2, 3])
+        self.assertEqual(self.index.search('dark'), [])
+        self.assertEqual(self.index.search('knight'), [])
+        self.assertEqual(self.index.search('incep'), [{'id': 1, 'title': 'Inception'}])
+
+@unittest.skipUnless(connection.vendor in ('sqlite', 'postgresql'), "plan checks are written for SQLite and PostgreSQL")
+class MovieFilterIndexTests(TestCase):
+    """EXPLAIN-checked index use of the movie list filters."""
+
+    def setUp(self):
+        clear_caches()
+        movies = create_movies(200, genre_ids=(28, 12))
+        for movie in movies:
+            movie.release_date = datetime.date(1990, 1, 1) + datetime.timedelta(days=movie.tmdb_id * 30)
+        Movie.objects.bulk_update(movies, ['release_date'])
+
+    def explain(self, **params):
+        """Return the plan of the movie list query for the given filters."""
+        if connection.vendor == 'postgresql':
+            # The test tables are tiny, so make the planner show the index it would use at scale.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        request = Request(APIRequestFactory().get('/api/movies/', params))
+        return movie_values(MovieFilter().filter_queryset(request, MovieViewSet.queryset, None)).explain()
+
+    def test_genre_filter_uses_genre_movie_index(self):
+        self.assertIn('movie_genre_genre_movie_idx', self.explain(genre='28'))
+
+    def test_release_date_range_uses_release_date_index(self):
+        plan = self.explain(release_date_after='2000-01-01', release_date_before='2001-01-01')
+        self.assertIn('movie_release_date_idx', plan)
+
+    def test_sort_with_cursor_pagination_is_rejected(self):
+        response = APIClient().get('/api/movies/', {'sort': 'newest', 'pagination': 'cursor'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('sort', response.json())
+
+    def test_search_with_cursor_pagination_is_rejected(self):
+        response = APIClient().get('/api/movies/', {'search': 'movie', 'pagination': 'cursor'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('search', response.json())
+
+class BulkFavoriteTests(TestCase):
+    """Bulk adds report and count only the rows they actually insert."""
+
+    def setUp(self):
+        clear_caches()
+        self.movies = create_movies(2)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='viewer', email='viewer@example.com'))
+
+    def bulk_add(self, movie_ids):
+        response = self.client.post('/api/favorite-movies/bulk/', {'movie_ids': movie_ids}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return {row['movie_id']: row['status'] for row in response.json()['results']}
+
+    def test_repeated_add_is_counted_once(self):
+        first, second = self.movies
+        self.assertEqual(self.bulk_add([first.id, 999]), {first.id: 'added', 999: 'not_found'})
+        self.assertEqual(self.bulk_add([first.id, second.id]), {first.id: 'already_favorited', second.id: 'added'})
+        counts = dict(Movie.objects.values_list('id', 'favorite_count'))
+        self.assertEqual(counts, {first.id: 1, second.id: 1})
+
+
+class UpsertQueryCountTests(TestCase):
+    """TMDB page upserts run a fixed number of queries, whatever the page size."""
+
+    # PostgreSQL also refreshes the search vectors of the written movies.
+    search_queries = 1 if connection.vendor == 'postgresql' else 0
+
+    def setUp(self):
+        clear_caches()
+
+    def upsert(self, count, title='Movie'):
+        results = [
+            {'id': index, 'title': f"{title} {index}", 'overview': '', 'release_date': '2020-01-01', 'genre_ids': [28, 12]}
+            for index in range(1, count + 1)
+        ]
+        return upsert_tmdb_movies(results, {28: 'Action', 12: 'Adventure'})
+
+    def test_new_page(self):
+        # Savepoint, movie read (no stored genres to read yet), genre insert,
+        # movie upsert, movie-genre delete and insert, release.
+        with self.assertNumQueries(7 + self.search_queries):
+            self.assertEqual(len(self.upsert(100)), 100)
+
+    def test_changed_page(self):
+        self.upsert(20)
+        # Savepoint, movie and genre reads, then the same four writes, release.
+        with self.assertNumQueries(8 + self.search_queries):
+            self.assertEqual(len(self.upsert(100, 'Renamed')), 100)
+
+    def test_unchanged_page(self):
+        self.upsert(100)
+        with self.assertNumQueries(4):
+            self.assertEqual(self.upsert(100), [])
@@ -5,6 +5,7 @@ from movieapp.views.auth_views import token_obtain_pair, token_refresh
 from movieapp.views.user_views import UserViewSet, RegisterView
 from movieapp.views.movie_views import MovieViewSet
 from movieapp.views.favorite_movie_views import FavoriteMovieViewSet
+from movieapp.views.recommendation_views import RecommendationView
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet)
@@ -16,4 +17,5 @@ urlpatterns = [
     path('token/', token_obtain_pair, name='token_obtain_pair'),
     path('token/refresh/', token_refresh, name='token_refresh'),
     path('register/', RegisterView.as_view(), name='register'),
+    path('recommendations/', RecommendationView.as_view(), name='recommendations'),
 ]
\ No newline at end of file
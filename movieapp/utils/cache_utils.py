@@ -1,43 +1,271 @@
+import gzip
+import hashlib
 import logging
+import math
+import random
+import re
+import time
+from urllib.parse import urlencode
 from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from movieapp.constants import CACHE_TIMEOUT, PAGE_SIZE
+from movieapp.constants import (
+    CACHE_TIMEOUT, PAGE_SIZE, API_VERSION, SERIALIZER_VERSION, CACHE_COMPRESS_MIN_BYTES,
+    CACHE_STALE_WINDOW, CACHE_XFETCH_BETA, CACHE_REFRESH_LOCK_TIMEOUT,
+)
+from movieapp.utils.tiered_cache import tiered_cache
 
 logger = logging.getLogger(__name__)
 
+accepts_gzip_re = re.compile(r"\bgzip\b")
+
+def get_cache_generation(namespace):
+    """Return the current generation of a cached collection.
+
+    Always read from Redis, never from the in-process tier, so a bump is
+    seen by every worker on its next request even if an invalidation
+    message is late or lost.
+
+    Args:
+        namespace (str): Logical collection (e.g., 'favorite_movie_list_1').
+
+    Returns:
+        int: Generation number embedded in the collection's cache keys.
+    """
+    return cache.get_or_set(f"{namespace}_gen", 1, timeout=None)
+
+def bump_cache_generation(namespace):
+    """Invalidate every cached page of a collection in O(1).
+
+    Old keys are never deleted; they stop being read once the generation
+    changes and expire on their own.
+
+    Args:
+        namespace (str): Logical collection to invalidate.
+
+    Returns:
+        int: New generation number.
+    """
+    key = f"{namespace}_gen"
+    cache.add(key, 1, timeout=None)
+    generation = cache.incr(key)
+    logger.info(f"Cache generation for {namespace} bumped to {generation}")
+    return generation
+
 class CacheMixin:
-    """Mixin for handling caching in ViewSets."""
+    """Mixin for handling caching in ViewSets.
+
+    Entries stay fresh for cache_timeout seconds, then remain readable for
+    stale_window more seconds while a single request refreshes them.
+    """
     cache_timeout = CACHE_TIMEOUT
+    stale_window = CACHE_STALE_WINDOW
     page_size = PAGE_SIZE
+    serializer_version = SERIALIZER_VERSION
+    # Store rendered JSON bytes instead of response data, so hits skip DRF rendering.
+    cache_rendered = False
+
+    def get_cache_namespace(self, prefix, identifier=''):
+        """Return the logical collection a cache key belongs to.
+        
+        Args:
+            prefix (str): Cache key prefix (e.g., 'movie_list').
+            identifier (str): Optional identifier (e.g., user ID).
+        
+        Returns:
+            str: Namespace whose generation is embedded in the key.
+        """
+        return f"{prefix}_{identifier}"
+
+    def get_request_fingerprint(self, request, identifier=''):
+        """Hash everything that can change the response into a stable digest.
+        
+        Query parameters are sorted so their order does not matter. The user
+        scope, serializer version and API version are included so responses
+        are never shared across users or output formats.
+        
+        Args:
+            request: HTTP request object.
+            identifier (str): User scope of the response, if any.
+        
+        Returns:
+            str: Hex digest of the canonical request.
+        """
+        params = sorted((key, value) for key, values in request.GET.lists() for value in values)
+        canonical = "|".join([
+            urlencode(params),
+            f"scope={identifier}",
+            f"serializer={self.serializer_version}",
+            f"api={getattr(request, 'version', None) or API_VERSION}",
+        ])
+        return hashlib.sha256(canonical.encode()).hexdigest()[:32]
 
-    def get_cache_key(self, request, prefix, identifier=''):
-        """Generate a cache key based on request and identifier.
+    def get_cache_key(self, request, prefix, identifier='', namespace=None):
+        """Generate a cache key based on the request fingerprint and collection generation.
         
         Args:
             request: HTTP request object.
             prefix (str): Cache key prefix (e.g., 'movie_list').
             identifier (str): Optional identifier (e.g., user ID).
+            namespace (str): Collection to version the key with; defaults to
+                get_cache_namespace(prefix, identifier).
         
         Returns:
             str: Cache key string.
         """
-        page = request.GET.get('page', '1')
-        return f"{prefix}_{identifier}_page_{page}"
+        generation = get_cache_generation(namespace or self.get_cache_namespace(prefix, identifier))
+        return f"{prefix}_{identifier}_gen_{generation}_{self.get_request_fingerprint(request, identifier)}"
+
+    def invalidate_cache(self, prefix, identifier='', namespace=None):
+        """Invalidate every cached page and variant of a collection.
+        
+        Args:
+            prefix (str): Cache key prefix (e.g., 'favorite_movie_list').
+            identifier (str): Optional identifier (e.g., user ID).
+            namespace (str): Collection to invalidate; defaults to
+                get_cache_namespace(prefix, identifier).
+        """
+        bump_cache_generation(namespace or self.get_cache_namespace(prefix, identifier))
+
+    def render_cache_entry(self, data):
+        """Render data to JSON bytes, gzip them if large, and compute an ETag.
+        
+        Args:
+            data: Response data to render.
+        
+        Returns:
+            dict: {'body': bytes, 'gzip': bool, 'etag': str}.
+        """
+        body = JSONRenderer().render(data)
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        if len(body) >= CACHE_COMPRESS_MIN_BYTES:
+            return {'body': gzip.compress(body), 'gzip': True, 'etag': etag}
+        return {'body': body, 'gzip': False, 'etag': etag}
+
+    def build_rendered_response(self, entry):
+        """Build an HttpResponse straight from a rendered cache entry.
+        
+        Gzipped bodies are sent as-is to clients that accept gzip and
+        decompressed for the others.
+        
+        Args:
+            entry (dict): Entry produced by render_cache_entry.
+        
+        Returns:
+            HttpResponse: JSON response with ETag set.
+        """
+        body, etag = entry['body'], entry['etag']
+        send_gzip = entry['gzip'] and accepts_gzip_re.search(self.request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if entry['gzip'] and not send_gzip:
+            body = gzip.decompress(body)
+        response = HttpResponse(body, content_type='application/json')
+        if send_gzip:
+            response['Content-Encoding'] = 'gzip'
+            etag = f'{etag[:-1]}-gzip"'
+        if entry['gzip']:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        response['ETag'] = etag
+        return response
+
+    def etag_matches(self, etag):
+        """Return True if the request's If-None-Match covers etag.
+        
+        Uses weak comparison, so W/ prefixes and the -gzip variant suffix
+        still match the stored ETag.
+        
+        Args:
+            etag (str): Quoted ETag of the current representation.
+        """
+        header = self.request.META.get('HTTP_IF_NONE_MATCH')
+        if not header or not etag:
+            return False
+        candidates = parse_etags(header)
+        return '*' in candidates or any(
+            candidate.removeprefix('W/').replace('-gzip"', '"') == etag for candidate in candidates
+        )
+
+    def not_modified_response(self, etag):
+        """Build an empty 304 response carrying etag."""
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    def initial(self, request, *args, **kwargs):
+        """Record when the request started so cache entries know their compute time."""
+        self._cache_started = time.monotonic()
+        super().initial(request, *args, **kwargs)
+
+    def should_refresh(self, cache_key, entry):
+        """Decide whether this request should recompute a cached entry early.
+        
+        XFetch: the chance of an early refresh rises as expiry approaches and
+        is scaled by how long the entry took to compute. Only the request
+        that wins the refresh lock recomputes; everyone else keeps serving
+        the cached value, even past expiry within the stale window. The
+        winner first checks Redis, since the entry may only be old in this
+        worker's L1 after another worker already refreshed it; then it
+        adopts that copy for later requests instead of recomputing.
+        
+        Args:
+            cache_key (str): Cache key of the entry.
+            entry (dict): Envelope with 'expires_at' and 'delta'.
+        
+        Returns:
+            bool: True if this request should recompute and re-cache the entry.
+        """
+        jitter = entry['delta'] * CACHE_XFETCH_BETA * -math.log(1.0 - random.random())
+        if time.time() + jitter < entry['expires_at']:
+            return False
+        if not cache.add(f"{cache_key}_refresh", 1, timeout=CACHE_REFRESH_LOCK_TIMEOUT):
+            return False
+        current = cache.get(cache_key)
+        if isinstance(current, dict) and current.get('expires_at', 0) > entry['expires_at']:
+            tiered_cache.set_local(cache_key, current, self.cache_timeout + self.stale_window)
+            cache.delete(f"{cache_key}_refresh")
+            return False
+        logger.info(f"Refreshing {cache_key} ahead of expiry")
+        return True
 
     def get_cached_response(self, cache_key):
         """Retrieve cached data for the given cache key.
         
+        Looks in the in-process tier first, then Redis. On a miss, concurrent
+        requests for the same key in this worker wait for the first one to
+        fill it instead of all recomputing. With cache_rendered, the cached
+        bytes are returned directly without any serializer or renderer work,
+        and a matching If-None-Match is answered with 304 after looking up
+        only the stored ETag.
+        
         Args:
             cache_key (str): Cache key to retrieve.
         
         Returns:
             Response: Cached response or None if not found.
         """
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            logger.info(f"Returning cached data for {cache_key}")
-            return Response(cached_data)
-        return None
+        if self.cache_rendered and self.request.META.get('HTTP_IF_NONE_MATCH'):
+            etag = tiered_cache.get(f"{cache_key}_etag")
+            if self.etag_matches(etag):
+                logger.info(f"Returning 304 for {cache_key}")
+                return self.not_modified_response(etag)
+
+        entry = tiered_cache.get(cache_key)
+        if entry is None:
+            if tiered_cache.begin_fill(cache_key):
+                self._pending_cache_fills = getattr(self, '_pending_cache_fills', set()) | {cache_key}
+                return None
+            entry = tiered_cache.get(cache_key)
+            if entry is None:
+                return None
+        if not isinstance(entry, dict) or 'expires_at' not in entry or self.should_refresh(cache_key, entry):
+            return None
+        cached_data = entry['value']
+        logger.info(f"Returning cached data for {cache_key}")
+        if self.cache_rendered:
+            return self.build_rendered_response(cached_data)
+        return Response(cached_data)
 
     def cache_response(self, cache_key, data):
         """Cache response data with the given cache key.
@@ -46,5 +274,36 @@ class CacheMixin:
             cache_key (str): Cache key to store data.
             data: Data to cache (e.g., serialized response).
         """
-        cache.set(cache_key, data, timeout=self.cache_timeout)
-        logger.info(f"Cached data for {cache_key}")
\ No newline at end of file
+        timeout = self.cache_timeout + self.stale_window
+        if self.cache_rendered:
+            data = self.render_cache_entry(data)
+            tiered_cache.set(f"{cache_key}_etag", data['etag'], timeout=timeout)
+            self._response_etag = data['etag']
+        entry = {
+            'value': data,
+            'expires_at': time.time() + self.cache_timeout,
+            'delta': time.monotonic() - getattr(self, '_cache_started', time.monotonic()),
+        }
+        tiered_cache.set(cache_key, entry, timeout=timeout)
+        tiered_cache.end_fill(cache_key)
+        cache.delete(f"{cache_key}_refresh")
+        getattr(self, '_pending_cache_fills', set()).discard(cache_key)
+        logger.info(f"Cached data for {cache_key}")
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Release pending cache fills and apply the ETag of a freshly cached response.
+        
+        Requests waiting on keys this request never cached (e.g., on errors)
+        are released. A response that was just cached gets its ETag, or is
+        turned into a 304 if the client already holds that version.
+        """
+        for cache_key in getattr(self, '_pending_cache_fills', ()):
+            tiered_cache.end_fill(cache_key)
+        self._pending_cache_fills = set()
+        etag = getattr(self, '_response_etag', None)
+        if etag and response.status_code == 200 and not response.has_header('ETag'):
+            if self.etag_matches(etag):
+                response = self.not_modified_response(etag)
+            else:
+                response['ETag'] = etag
+        return super().finalize_response(request, response, *args, **kwargs)
\ No newline at end of file
@@ -0,0 +1,114 @@
+# movieapp/utils/fast_serializers.py
+from collections import defaultdict
+from rest_framework import serializers
+from movieapp.models import Movie
+
+MovieGenre = Movie.genres.through
+
+MOVIE_COLUMNS = ("id", "title", "description", "release_date", "tmdb_id", "poster_path")
+
+# Reuse DRF's own fields for dates so the output format is exactly the serializers'
+# ('2010-07-16', '2024-08-07T12:00:00Z').
+_date_field = serializers.DateField()
+_datetime_field = serializers.DateTimeField()
+
+def get_genres_by_movie(movie_ids):
+    """Fetch the genres of many movies in one query.
+
+    Genres are ordered by ID, the order the genre prefetch returns them in.
+
+    Args:
+        movie_ids (iterable): Movie IDs.
+
+    Returns:
+        dict: Mapping of movie ID to a list of {'id', 'name'} dicts.
+    """
+    genres = defaultdict(list)
+    rows = (
+        MovieGenre.objects.filter(movie_id__in=movie_ids)
+        .order_by('genre_id')
+        .values_list('movie_id', 'genre_id', 'genre__name')
+    )
+    for movie_id, genre_id, name in rows:
+        genres[movie_id].append({'id': genre_id, 'name': name})
+    return genres
+
+def _movie_dict(row, genres, prefix=''):
+    """Build the MovieSerializer representation of one values() row."""
+    movie_id = row[f'{prefix}id']
+    return {
+        'id': movie_id,
+        'title': row[f'{prefix}title'],
+        'description': row[f'{prefix}description'],
+        'release_date': _date_field.to_representation(row[f'{prefix}release_date']),
+        'genres': genres.get(movie_id, []),
+        'tmdb_id': row[f'{prefix}tmdb_id'],
+        'poster_path': row[f'{prefix}poster_path'],
+    }
+
+def movie_values(queryset):
+    """Turn a Movie queryset into a values() queryset for serialize_movie_rows.
+
+    Args:
+        queryset (QuerySet): Movie queryset, possibly filtered and ordered.
+
+    Returns:
+        QuerySet: Same rows as dicts, without the genre prefetch.
+    """
+    return queryset.prefetch_related(None).values(*MOVIE_COLUMNS)
+
+def serialize_movie_rows(rows):
+    """Serialize movie values() rows exactly like MovieSerializer(many=True).
+
+    Args:
+        rows (list): Dicts from movie_values.
+
+    Returns:
+        list: Serialized movies.
+    """
+    genres = get_genres_by_movie([row['id'] for row in rows])
+    return [_movie_dict(row, genres) for row in rows]
+
+def serialize_movies_in_order(movie_ids):
+    """Serialize movies by ID, preserving the given order and skipping missing IDs.
+
+    Args:
+        movie_ids (list): Movie IDs.
+
+    Returns:
+        list: Serialized movies.
+    """
+    rows = {row['id']: row for row in Movie.objects.filter(id__in=movie_ids).values(*MOVIE_COLUMNS)}
+    return serialize_movie_rows([rows[movie_id] for movie_id in movie_ids if movie_id in rows])
+
+def favorite_values(queryset):
+    """Turn a FavoriteMovie queryset into a values() queryset for serialize_favorite_rows.
+
+    Args:
+        queryset (QuerySet): FavoriteMovie queryset, possibly filtered and ordered.
+
+    Returns:
+        QuerySet: Favorites joined with their user and movie columns, as dicts.
+    """
+    movie_columns = [f'movie__{column}' for column in MOVIE_COLUMNS]
+    return queryset.prefetch_related(None).values('id', 'user__username', 'added_at', *movie_columns)
+
+def serialize_favorite_rows(rows):
+    """Serialize favorite values() rows exactly like FavoriteMovieSerializer(many=True).
+
+    Args:
+        rows (list): Dicts from favorite_values.
+
+    Returns:
+        list: Serialized favorites.
+    """
+    genres = get_genres_by_movie([row['movie__id'] for row in rows])
+    return [
+        {
+            'id': row['id'],
+            'user': row['user__username'],
+            'movie': _movie_dict(row, genres, prefix='movie__'),
+            'added_at': _datetime_field.to_representation(row['added_at']),
+        }
+        for row in rows
+    ]
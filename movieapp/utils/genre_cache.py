@@ -0,0 +1,66 @@
+# movieapp/utils/genre_cache.py
+import logging
+import threading
+import time
+from django.core.cache import cache
+from movieapp.constants import GENRE_CACHE_KEY, GENRE_CACHE_TIMEOUT, GENRE_LOCAL_CACHE_TIMEOUT
+from movieapp.models import Genre
+from movieapp.utils.tmdb_utils import TMDBUtils
+
+logger = logging.getLogger(__name__)
+
+_local_genre_map = None
+_local_expires_at = 0
+_local_lock = threading.Lock()
+
+def _set_local(genre_map):
+    """Store the genre map in the in-process tier."""
+    global _local_genre_map, _local_expires_at
+    with _local_lock:
+        _local_genre_map = genre_map
+        _local_expires_at = time.monotonic() + GENRE_LOCAL_CACHE_TIMEOUT
+
+def get_genre_map():
+    """Return the TMDB genre ID to name mapping without calling TMDB.
+
+    Lookup order is the in-process dict, then Redis, then the Genre table.
+    TMDB itself is only contacted by refresh_genre_map from the sync worker.
+
+    Returns:
+        dict: Mapping of genre IDs to names.
+    """
+    if _local_genre_map is not None and time.monotonic() < _local_expires_at:
+        return _local_genre_map
+
+    genre_map = cache.get(GENRE_CACHE_KEY)
+    if genre_map is None:
+        genre_map = dict(Genre.objects.values_list('id', 'name'))
+        cache.set(GENRE_CACHE_KEY, genre_map, timeout=GENRE_CACHE_TIMEOUT)
+        logger.info(f"Seeded genre cache from database with {len(genre_map)} genres")
+    _set_local(genre_map)
+    return genre_map
+
+def refresh_genre_map():
+    """Fetch genres from TMDB and update the Genre table and both cache tiers.
+
+    Returns:
+        dict: Refreshed mapping, or an empty dict if TMDB returned nothing.
+    """
+    genre_map = TMDBUtils.get_genre_list()
+    if not genre_map:
+        logger.warning("TMDB returned no genres, keeping cached genre map")
+        return {}
+
+    try:
+        Genre.objects.bulk_create(
+            [Genre(id=genre_id, name=name) for genre_id, name in genre_map.items()],
+            update_conflicts=True,
+            unique_fields=['id'],
+            update_fields=['name'],
+        )
+    except Exception as e:
+        logger.error(f"Failed to store refreshed genres: {str(e)}")
+    cache.set(GENRE_CACHE_KEY, genre_map, timeout=GENRE_CACHE_TIMEOUT)
+    _set_local(genre_map)
+    logger.info(f"Refreshed genre cache with {len(genre_map)} genres")
+    return genre_map
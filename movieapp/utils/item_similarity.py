@@ -0,0 +1,63 @@
+# movieapp/utils/item_similarity.py
+import logging
+import numpy as np
+from scipy import sparse
+from django.db import transaction
+from movieapp.constants import REC_NEIGHBORS
+from movieapp.models import FavoriteMovie, MovieNeighbor
+
+logger = logging.getLogger(__name__)
+
+def build_item_neighbors(top_k=REC_NEIGHBORS):
+    """Rebuild the top-K item-item neighbour table from FavoriteMovie rows.
+
+    Builds a sparse user x movie matrix, multiplies it by its transpose to get
+    movie co-occurrence counts, turns those into cosine similarities and keeps
+    the top_k neighbours of every movie.
+
+    Args:
+        top_k (int): Number of neighbours to keep per movie.
+
+    Returns:
+        int: Number of MovieNeighbor rows written.
+    """
+    pairs = np.array(list(FavoriteMovie.objects.values_list('user_id', 'movie_id')), dtype=np.int64).reshape(-1, 2)
+    if not len(pairs):
+        MovieNeighbor.objects.all().delete()
+        return 0
+
+    user_ids, user_index = np.unique(pairs[:, 0], return_inverse=True)
+    movie_ids, movie_index = np.unique(pairs[:, 1], return_inverse=True)
+    favorites = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.float32), (user_index, movie_index)),
+        shape=(len(user_ids), len(movie_ids)),
+    )
+
+    co_counts = (favorites.T @ favorites).tocsr()
+    co_counts = (co_counts - sparse.diags(co_counts.diagonal())).tocsr()
+    co_counts.eliminate_zeros()
+
+    degrees = np.asarray(favorites.sum(axis=0)).ravel()
+    rows = np.repeat(np.arange(co_counts.shape[0]), np.diff(co_counts.indptr))
+    scores = co_counts.data / np.sqrt(degrees[rows] * degrees[co_counts.indices])
+
+    neighbors = []
+    for row in range(co_counts.shape[0]):
+        start, end = co_counts.indptr[row], co_counts.indptr[row + 1]
+        if start == end:
+            continue
+        row_scores = scores[start:end]
+        top = np.argpartition(-row_scores, top_k)[:top_k] if end - start > top_k else np.arange(end - start)
+        for offset in top:
+            neighbors.append(MovieNeighbor(
+                movie_id=int(movie_ids[row]),
+                neighbor_id=int(movie_ids[co_counts.indices[start + offset]]),
+                co_count=int(co_counts.data[start + offset]),
+                score=float(row_scores[offset]),
+            ))
+
+    with transaction.atomic():
+        MovieNeighbor.objects.all().delete()
+        MovieNeighbor.objects.bulk_create(neighbors, batch_size=5000)
+    logger.info(f"Built {len(neighbors)} item neighbours for {len(movie_ids)} movies from {len(pairs)} favorites")
+    return len(neighbors)
@@ -0,0 +1,129 @@
+# movieapp/utils/leaderboard.py
+import json
+import logging
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django_redis import get_redis_connection
+from movieapp.constants import LEADERBOARD_KEY, LEADERBOARD_META_KEY, LEADERBOARD_SIZE, LEADERBOARD_LIMIT
+from movieapp.models import FavoriteMovie, Movie
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_FIELDS = ('id', 'title', 'poster_path')
+
+def _write_entries(pipe, rows, zset_key=LEADERBOARD_KEY, meta_key=LEADERBOARD_META_KEY):
+    """Queue ZADD/HSET (or removal, for zero counts) of Movie value rows on a Redis pipeline."""
+    for row in rows:
+        if row['favorite_count'] > 0:
+            pipe.zadd(zset_key, {row['id']: row['favorite_count']})
+            pipe.hset(meta_key, row['id'], json.dumps({field: row[field] for field in LEADERBOARD_FIELDS}))
+        else:
+            pipe.zrem(zset_key, row['id'])
+            pipe.hdel(meta_key, row['id'])
+
+def _drop_meta(pipe, members):
+    """Delete metadata of trimmed members, unless another writer has re-ranked them since."""
+    scores = [pipe.zscore(LEADERBOARD_KEY, member) for member in members]
+    pipe.multi()
+    stale = [member for member, score in zip(members, scores) if score is None]
+    if stale:
+        pipe.hdel(LEADERBOARD_META_KEY, *stale)
+
+def sync_leaderboard(movie_ids):
+    """Copy the current favorite counts of some movies into the Redis leaderboard.
+
+    Scores are written as absolute values, so replaying this is harmless.
+    Members pushed below LEADERBOARD_SIZE are trimmed along with their metadata.
+
+    Args:
+        movie_ids (iterable): Movies whose favorite_count changed.
+    """
+    rows = Movie.objects.filter(id__in=list(movie_ids)).values(*LEADERBOARD_FIELDS, 'favorite_count')
+    try:
+        conn = get_redis_connection('default')
+        pipe = conn.pipeline(transaction=True)
+        _write_entries(pipe, rows)
+        pipe.zrange(LEADERBOARD_KEY, 0, -(LEADERBOARD_SIZE + 1))
+        pipe.zremrangebyrank(LEADERBOARD_KEY, 0, -(LEADERBOARD_SIZE + 1))
+        trimmed = pipe.execute()[-2]
+        if trimmed:
+            conn.transaction(lambda watched: _drop_meta(watched, trimmed), LEADERBOARD_KEY)
+    except Exception as e:
+        logger.warning(f"Failed to update favorites leaderboard: {str(e)}")
+
+def update_favorite_counts(deltas):
+    """Atomically adjust Movie.favorite_count and refresh the leaderboard on commit.
+
+    Call inside the transaction that adds or removes the favorites.
+
+    Args:
+        deltas (dict): Mapping of movie ID to change in favorites (e.g. {12: 1}).
+    """
+    movie_ids_by_delta = defaultdict(list)
+    for movie_id, delta in deltas.items():
+        if delta:
+            movie_ids_by_delta[delta].append(movie_id)
+    for delta, movie_ids in movie_ids_by_delta.items():
+        Movie.objects.filter(id__in=movie_ids).update(favorite_count=Greatest(F('favorite_count') + delta, 0))
+    changed = [movie_id for movie_ids in movie_ids_by_delta.values() for movie_id in movie_ids]
+    if changed:
+        transaction.on_commit(lambda: sync_leaderboard(changed))
+
+def reconcile_favorite_counts():
+    """Fix favorite_count drift from the FavoriteMovie table and rebuild the leaderboard.
+
+    Returns:
+        int: Number of movies whose count was corrected.
+    """
+    actual = Coalesce(Subquery(
+        FavoriteMovie.objects.filter(movie=OuterRef('pk'))
+        .order_by().values('movie').annotate(count=Count('id')).values('count')
+    ), 0)
+    drifted = Movie.objects.annotate(actual=actual).exclude(favorite_count=F('actual')).values('pk')
+    fixed = Movie.objects.filter(pk__in=drifted).update(favorite_count=actual)
+    if fixed:
+        logger.warning(f"Corrected favorite_count on {fixed} movies")
+
+    rows = list(
+        Movie.objects.filter(favorite_count__gt=0)
+        .order_by('-favorite_count', 'id')
+        .values(*LEADERBOARD_FIELDS, 'favorite_count')[:LEADERBOARD_SIZE]
+    )
+    pipe = get_redis_connection('default').pipeline(transaction=True)
+    # Build under temporary keys and swap them in, so readers never see a partial board.
+    _write_entries(pipe, rows, f"{LEADERBOARD_KEY}_tmp", f"{LEADERBOARD_META_KEY}_tmp")
+    if rows:
+        pipe.rename(f"{LEADERBOARD_KEY}_tmp", LEADERBOARD_KEY)
+        pipe.rename(f"{LEADERBOARD_META_KEY}_tmp", LEADERBOARD_META_KEY)
+    else:
+        pipe.delete(LEADERBOARD_KEY, LEADERBOARD_META_KEY)
+    pipe.execute()
+    logger.info(f"Rebuilt favorites leaderboard with {len(rows)} movies")
+    return fixed
+
+def get_leaderboard(limit=LEADERBOARD_LIMIT):
+    """Return the most favorited movies from Redis without touching the database.
+
+    Args:
+        limit (int): Number of movies to return.
+
+    Returns:
+        list: Dicts with id, title, poster_path and favorite_count, most favorited first;
+            empty when Redis is unavailable.
+    """
+    try:
+        conn = get_redis_connection('default')
+        entries = conn.zrevrange(LEADERBOARD_KEY, 0, limit - 1, withscores=True)
+        if not entries:
+            return []
+        metas = conn.hmget(LEADERBOARD_META_KEY, [member for member, score in entries])
+    except Exception as e:
+        logger.warning(f"Failed to read favorites leaderboard: {str(e)}")
+        return []
+    return [
+        {**json.loads(meta), 'favorite_count': int(score)}
+        for (member, score), meta in zip(entries, metas)
+        if meta is not None
+    ]
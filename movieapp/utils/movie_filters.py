@@ -0,0 +1,65 @@
+# movieapp/utils/movie_filters.py
+from django.db.models import F
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.pagination import CursorPagination
+from movieapp.models import MovieGenre
+
+class MovieFilter(BaseFilterBackend):
+    """Genre, release date and sort filters for the movie list.
+
+    ?genre=28,12 keeps movies in any of the given genre IDs,
+    ?release_date_after= and ?release_date_before= bound the release date
+    (inclusive, YYYY-MM-DD) and ?sort= is one of SORT_ORDERINGS. Sorting
+    applies to page number pagination; cursor pages always follow IDs, so
+    combining the two is rejected rather than silently ignoring the sort.
+    """
+    SORT_ORDERINGS = {
+        'newest': (F('release_date').desc(nulls_last=True), F('id').desc()),
+        'most_favorited': ('-favorite_count', 'id'),
+    }
+
+    def parse_genres(self, value):
+        """Parse a comma-separated list of genre IDs."""
+        try:
+            return [int(genre_id) for genre_id in value.split(',') if genre_id.strip()]
+        except ValueError:
+            raise ValidationError({'genre': ["Must be a comma-separated list of genre IDs."]})
+
+    def parse_date_param(self, request, name):
+        """Parse an optional YYYY-MM-DD query parameter."""
+        value = request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: ["Must be a date in YYYY-MM-DD format."]})
+        return parsed
+
+    def filter_queryset(self, request, queryset, view):
+        genres = self.parse_genres(request.query_params.get('genre', ''))
+        if genres:
+            # A subquery rather than a join, so movies in several genres are not duplicated.
+            queryset = queryset.filter(
+                id__in=MovieGenre.objects.filter(genre_id__in=genres).values('movie_id')
+            )
+
+        released_after = self.parse_date_param(request, 'release_date_after')
+        if released_after:
+            queryset = queryset.filter(release_date__gte=released_after)
+        released_before = self.parse_date_param(request, 'release_date_before')
+        if released_before:
+            queryset = queryset.filter(release_date__lte=released_before)
+
+        sort = request.query_params.get('sort')
+        if not sort:
+            return queryset
+        if sort not in self.SORT_ORDERINGS:
+            raise ValidationError({'sort': [f"Must be one of: {', '.join(self.SORT_ORDERINGS)}."]})
+        if isinstance(getattr(view, 'paginator', None), CursorPagination):
+            raise ValidationError({'sort': ["Not supported with cursor pagination, which always orders by ID."]})
+        return queryset.order_by(*self.SORT_ORDERINGS[sort])
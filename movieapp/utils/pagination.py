@@ -0,0 +1,153 @@
+# movieapp/utils/pagination.py
+import binascii
+from base64 import b64decode, b64encode
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from movieapp.constants import PAGE_SIZE, ESTIMATED_COUNT_MIN
+
+class RankedListCursorPagination(BasePagination):
+    """Cursor pagination over an already ranked, in-memory list.
+
+    The cursor is an opaque encoding of the position in the list, so as long as
+    the ranking is stable, consecutive pages never overlap.
+    """
+    page_size = PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_list(self, items, request):
+        """Return the slice of items for the requested cursor.
+
+        Args:
+            items (list): Ranked items.
+            request: HTTP request object.
+
+        Returns:
+            list: Items on the current page.
+        """
+        self.base_url = request.build_absolute_uri()
+        self.offset = self.decode_cursor(request)
+        self.has_next = self.offset + self.page_size < len(items)
+        self.has_previous = self.offset > 0
+        return items[self.offset:self.offset + self.page_size]
+
+    def decode_cursor(self, request):
+        """Decode the cursor query parameter into a list offset."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return 0
+        try:
+            offset = int(b64decode(encoded.encode('ascii')).decode('ascii'))
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if offset < 0:
+            raise NotFound(self.invalid_cursor_message)
+        return offset
+
+    def encode_cursor(self, offset):
+        """Build the URL pointing at the page starting at offset."""
+        if offset <= 0:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        token = b64encode(str(offset).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.offset + self.page_size)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.offset - self.page_size)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+def estimate_count(queryset):
+    """Return PostgreSQL's row estimate for an unfiltered queryset's table.
+
+    Args:
+        queryset (QuerySet): Queryset to count.
+
+    Returns:
+        int or None: The planner estimate, or None if the queryset is filtered,
+            the database is not PostgreSQL, or the table is too small (or not yet
+            analyzed) for the estimate to be worth its inaccuracy.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql' or queryset.query.where:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < ESTIMATED_COUNT_MIN:
+        return None
+    return row[0]
+
+class EstimatedCountPaginator(DjangoPaginator):
+    """Django paginator whose count comes from estimate_count when available."""
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        return estimate if estimate is not None else super().count
+
+class EstimatedCountPageNumberPagination(PageNumberPagination):
+    """Page number pagination that can replace the exact COUNT(*) with an estimate.
+
+    Pass ?count=estimate to use the planner's row estimate for unfiltered lists;
+    filtered lists and other databases still get an exact count.
+    """
+    page_size = PAGE_SIZE
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.count_query_param) == 'estimate':
+            self.django_paginator_class = EstimatedCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+class MovieCursorPagination(CursorPagination):
+    """Keyset pagination over movie IDs; deep pages cost the same as the first."""
+    page_size = PAGE_SIZE
+    ordering = ('id',)
+
+class FavoriteMovieCursorPagination(CursorPagination):
+    """Keyset pagination over favorites, newest first."""
+    page_size = PAGE_SIZE
+    ordering = ('-added_at', '-id')
+
+class OptionalCursorPaginationMixin:
+    """Switch a view to cursor_pagination_class when the client opts in.
+
+    Clients opt in with ?pagination=cursor, and stay in cursor mode by following
+    the 'next' and 'previous' links, which carry a 'cursor' parameter. Cursor
+    pages have no 'count'.
+    """
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if self.cursor_pagination_class is not None and (
+                params.get('pagination') == 'cursor' or 'cursor' in params
+            ):
+                self._paginator = self.cursor_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
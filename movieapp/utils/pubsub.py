@@ -0,0 +1,71 @@
+# movieapp/utils/pubsub.py
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from django_redis import get_redis_connection
+from movieapp.constants import PUBSUB_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+_handlers = defaultdict(list)
+_listener_pid = None
+_listener_lock = threading.Lock()
+
+def publish(event_type, **payload):
+    """Broadcast an event to every worker process through Redis pub/sub.
+
+    Args:
+        event_type (str): Event name handlers subscribe to.
+        payload: JSON-serializable event data.
+    """
+    try:
+        get_redis_connection('default').publish(PUBSUB_CHANNEL, json.dumps({'type': event_type, **payload}))
+    except Exception as e:
+        logger.warning(f"Failed to publish {event_type} event: {str(e)}")
+
+def subscribe(event_type, handler):
+    """Register a handler called with the payload of every event of this type.
+
+    Args:
+        event_type (str): Event name.
+        handler (callable): Called with the decoded event dict.
+    """
+    _handlers[event_type].append(handler)
+
+def ensure_listener():
+    """Start the background listener thread for this process if needed.
+
+    Safe to call on every request: the check is a pid comparison. The thread
+    is restarted in forked children, which do not inherit it.
+    """
+    global _listener_pid
+    if _listener_pid == os.getpid():
+        return
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+        _listener_pid = os.getpid()
+        threading.Thread(target=_listen, name='movieapp-pubsub', daemon=True).start()
+
+def _listen():
+    """Dispatch pub/sub events to handlers, reconnecting on errors."""
+    while True:
+        try:
+            pubsub = get_redis_connection('default').pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(PUBSUB_CHANNEL)
+            for message in pubsub.listen():
+                event = json.loads(message['data'])
+                for handler in _handlers.get(event.get('type'), []):
+                    try:
+                        handler(event)
+                    except Exception as e:
+                        logger.error(f"Pub/sub handler for {event.get('type')} failed: {str(e)}")
+        except NotImplementedError:
+            logger.warning("Cache backend does not support pub/sub, cross-process invalidation disabled")
+            return
+        except Exception as e:
+            logger.error(f"Pub/sub listener error: {str(e)}")
+            time.sleep(1)
@@ -0,0 +1,360 @@
+# movieapp/utils/recommendation_engine.py
+import logging
+import math
+import random
+import time
+from collections import defaultdict
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from movieapp.constants import (
+    REC_LIMIT, REC_POOL_SIZE, REC_POOL_TIMEOUT, REC_USER_PROFILE_TIMEOUT,
+    REC_SAMPLE_SIZE, REC_MAX_GENRES, REC_RESULT_TIMEOUT, REC_LOCK_TIMEOUT,
+    REC_MAX_RESULTS, REC_NEIGHBORS,
+)
+from movieapp.models import Genre, Movie, FavoriteMovie, MovieNeighbor
+from movieapp.utils.cache_utils import get_cache_generation, bump_cache_generation
+
+logger = logging.getLogger(__name__)
+
+MovieGenre = Movie.genres.through
+
+def _pool_key(genre_id):
+    """Cache key for a genre's candidate pool."""
+    return f"rec_pool_{genre_id}"
+
+def _profile_key(user_id):
+    """Cache key for a user's recommendation profile, versioned so favorite changes orphan it."""
+    return f"rec_user_{user_id}_v{get_recommendation_version(user_id)}"
+
+def _build_pools(genre_ids):
+    """Build candidate pools for the given genres and store them in the cache.
+
+    Each pool holds the REC_POOL_SIZE most favorited movies of the genre as
+    (movie_id, genre_ids) tuples so candidates can be scored without a query.
+
+    Args:
+        genre_ids (iterable): Genre IDs to build pools for.
+
+    Returns:
+        dict: Mapping of genre ID to pool.
+    """
+    pool_ids = {}
+    for genre_id in genre_ids:
+        pool_ids[genre_id] = list(
+            Movie.objects.filter(genres__id=genre_id)
+            .order_by('-favorite_count', '-id')
+            .values_list('id', flat=True)[:REC_POOL_SIZE]
+        )
+
+    movie_genres = defaultdict(list)
+    all_ids = {movie_id for ids in pool_ids.values() for movie_id in ids}
+    for movie_id, genre_id in MovieGenre.objects.filter(movie_id__in=all_ids).values_list('movie_id', 'genre_id'):
+        movie_genres[movie_id].append(genre_id)
+
+    pools = {
+        genre_id: [(movie_id, tuple(movie_genres[movie_id])) for movie_id in ids]
+        for genre_id, ids in pool_ids.items()
+    }
+    cache.set_many({_pool_key(genre_id): pool for genre_id, pool in pools.items()}, timeout=REC_POOL_TIMEOUT)
+    return pools
+
+def build_genre_pools():
+    """Rebuild the candidate pools of every genre.
+
+    Returns:
+        int: Number of pools built.
+    """
+    pools = _build_pools(Genre.objects.values_list('id', flat=True))
+    logger.info(f"Rebuilt {len(pools)} genre candidate pools")
+    return len(pools)
+
+def get_genre_pools(genre_ids):
+    """Return candidate pools for the given genres, building any that are missing.
+
+    Args:
+        genre_ids (list): Genre IDs.
+
+    Returns:
+        dict: Mapping of genre ID to pool.
+    """
+    cached = cache.get_many([_pool_key(genre_id) for genre_id in genre_ids])
+    pools = {genre_id: cached[_pool_key(genre_id)] for genre_id in genre_ids if _pool_key(genre_id) in cached}
+    missing = [genre_id for genre_id in genre_ids if genre_id not in pools]
+    if missing:
+        pools.update(_build_pools(missing))
+    return pools
+
+def get_user_profile(user_id):
+    """Return the user's favorite movie IDs and per-genre favorite counts.
+
+    Args:
+        user_id (int): User ID.
+
+    Returns:
+        dict: {'favorites': set of movie IDs, 'genre_counts': {genre_id: count}}.
+    """
+    key = _profile_key(user_id)
+    profile = cache.get(key)
+    if profile is not None:
+        return profile
+
+    favorites = set(FavoriteMovie.objects.filter(user_id=user_id).values_list('movie_id', flat=True))
+    genre_counts = dict(
+        MovieGenre.objects.filter(movie__favoritemovie__user_id=user_id)
+        .values('genre_id')
+        .annotate(count=Count('id'))
+        .values_list('genre_id', 'count')
+    )
+    profile = {'favorites': favorites, 'genre_counts': genre_counts}
+    cache.set(key, profile, timeout=REC_USER_PROFILE_TIMEOUT)
+    return profile
+
+def get_genre_weights(profile):
+    """Normalize a profile's genre counts into weights that sum to 1.
+
+    Args:
+        profile (dict): Profile as returned by get_user_profile.
+
+    Returns:
+        dict: Mapping of genre ID to weight.
+    """
+    total = sum(profile['genre_counts'].values())
+    if not total:
+        return {}
+    return {genre_id: count / total for genre_id, count in profile['genre_counts'].items() if count > 0}
+
+def recommend_movie_ids(user_id, limit=REC_LIMIT, rng=random):
+    """Recommend movies by weighted genre overlap with the user's favorites.
+
+    Samples from the pools of the user's strongest genres in proportion to
+    their weight, drops movies already favorited, and ranks the rest by the
+    sum of the user's weights over each candidate's genres.
+
+    Args:
+        user_id (int): User ID.
+        limit (int): Maximum number of movie IDs to return.
+        rng (random.Random): Source of randomness for sampling and tie-breaks.
+
+    Returns:
+        list: Recommended movie IDs, best first.
+    """
+    profile = get_user_profile(user_id)
+    weights = get_genre_weights(profile)
+    if not weights:
+        return []
+
+    top_genres = sorted(weights, key=weights.get, reverse=True)[:REC_MAX_GENRES]
+    top_weight = sum(weights[genre_id] for genre_id in top_genres)
+    pools = get_genre_pools(top_genres)
+
+    scores = {}
+    for genre_id in top_genres:
+        pool = pools.get(genre_id, [])
+        sample_size = min(len(pool), max(1, round(REC_SAMPLE_SIZE * weights[genre_id] / top_weight)))
+        for movie_id, genre_ids in rng.sample(pool, sample_size):
+            if movie_id in profile['favorites'] or movie_id in scores:
+                continue
+            scores[movie_id] = sum(weights.get(candidate_genre, 0) for candidate_genre in genre_ids)
+
+    ranked = sorted(scores, key=lambda movie_id: (-scores[movie_id], rng.random()))
+    return ranked[:limit]
+
+def recommend_similar_movie_ids(user_id, limit=REC_LIMIT):
+    """Recommend movies by merging the precomputed neighbours of the user's favorites.
+
+    Reads at most len(favorites) x REC_NEIGHBORS rows from MovieNeighbor and
+    sums the similarity scores of each neighbour across favorites.
+
+    Args:
+        user_id (int): User ID.
+        limit (int): Maximum number of movie IDs to return.
+
+    Returns:
+        list: Recommended movie IDs, best first.
+    """
+    favorites = get_user_profile(user_id)['favorites']
+    if not favorites:
+        return []
+
+    scores = defaultdict(float)
+    for neighbor_id, score in MovieNeighbor.objects.filter(movie_id__in=favorites).values_list('neighbor_id', 'score'):
+        if neighbor_id not in favorites:
+            scores[neighbor_id] += score
+    ranked = sorted(scores, key=lambda movie_id: (-scores[movie_id], movie_id))
+    return ranked[:limit]
+
+def _cooccurrence_counts(movie_ids, partner_ids):
+    """Count, from FavoriteMovie, how many users favorited both movies of each pair.
+
+    Args:
+        movie_ids (set): Movie IDs on one side of the pairs.
+        partner_ids (set): Movie IDs on the other side.
+
+    Returns:
+        dict: Mapping of (movie_id, partner_id) to co-occurrence count, for
+            pairs with a non-zero count.
+    """
+    rows = (
+        FavoriteMovie.objects.filter(movie_id__in=movie_ids, user__favoritemovie__movie_id__in=partner_ids)
+        .values_list('movie_id', 'user__favoritemovie__movie_id')
+        .annotate(count=Count('user_id'))
+        .order_by()
+    )
+    return {(movie_id, partner_id): count for movie_id, partner_id, count in rows if movie_id != partner_id}
+
+def _trim_neighbors(movie_ids, top_k=REC_NEIGHBORS):
+    """Delete all but the top_k highest scoring neighbours of each movie.
+
+    Args:
+        movie_ids (iterable): Movies to trim.
+        top_k (int): Number of neighbours to keep per movie.
+    """
+    ranked = defaultdict(list)
+    for pk, movie_id, score in MovieNeighbor.objects.filter(movie_id__in=movie_ids).values_list('pk', 'movie_id', 'score'):
+        ranked[movie_id].append((-score, pk))
+    extra = [pk for rows in ranked.values() if len(rows) > top_k for _, pk in sorted(rows)[top_k:]]
+    if extra:
+        MovieNeighbor.objects.filter(pk__in=extra).delete()
+
+def _refresh_cooccurrences(changed, partners):
+    """Recount the MovieNeighbor pairs between changed movies and their partners.
+
+    Counts are recomputed from FavoriteMovie rather than adjusted by deltas,
+    so they are exact even for pairs that an earlier trim dropped, and
+    replaying an update is harmless. Scores of the touched pairs use the
+    current favorite counts; every touched movie is then trimmed back to its
+    REC_NEIGHBORS best neighbours, so serving stays O(favorites x K).
+
+    Args:
+        changed (set): Movie IDs added to or removed from a user's favorites.
+        partners (set): The user's favorites, plus the changed movies.
+    """
+    counts = _cooccurrence_counts(changed, partners)
+    counts.update({(partner_id, movie_id): count for (movie_id, partner_id), count in list(counts.items())})
+    pairs = {(movie_id, partner_id) for movie_id in changed for partner_id in partners if movie_id != partner_id}
+    pairs |= {(partner_id, movie_id) for movie_id, partner_id in pairs}
+    if not pairs:
+        return
+    movie_ids = changed | partners
+    degrees = dict(
+        FavoriteMovie.objects.filter(movie_id__in=movie_ids)
+        .values('movie_id')
+        .annotate(count=Count('id'))
+        .values_list('movie_id', 'count')
+    )
+
+    def score(movie_id, neighbor_id, co_count):
+        return co_count / math.sqrt(max(degrees.get(movie_id, 0) * degrees.get(neighbor_id, 0), 1))
+
+    with transaction.atomic():
+        existing = MovieNeighbor.objects.select_for_update().filter(movie_id__in=movie_ids, neighbor_id__in=movie_ids)
+        seen, to_update, to_delete = set(), [], []
+        for row in existing:
+            pair = (row.movie_id, row.neighbor_id)
+            if pair not in pairs:
+                continue
+            seen.add(pair)
+            if pair not in counts:
+                to_delete.append(row.pk)
+            else:
+                row.co_count = counts[pair]
+                row.score = score(row.movie_id, row.neighbor_id, row.co_count)
+                to_update.append(row)
+        to_create = [
+            MovieNeighbor(movie_id=movie_id, neighbor_id=neighbor_id, co_count=count, score=score(movie_id, neighbor_id, count))
+            for (movie_id, neighbor_id), count in counts.items()
+            if (movie_id, neighbor_id) not in seen
+        ]
+        if to_update:
+            MovieNeighbor.objects.bulk_update(to_update, ['co_count', 'score'])
+        if to_delete:
+            MovieNeighbor.objects.filter(pk__in=to_delete).delete()
+        if to_create:
+            MovieNeighbor.objects.bulk_create(to_create, ignore_conflicts=True)
+        _trim_neighbors({movie_id for movie_id, _ in pairs})
+
+def apply_favorite_changes(user_id, added=(), removed=()):
+    """Update the recommendation indexes after a user's favorites changed.
+
+    Must be called after the FavoriteMovie rows were written. Recounts the
+    item co-occurrences of the changed movies and bumps the user's
+    recommendation version, which also retires the cached profile so it is
+    rebuilt from the database; patching it in place could lose a concurrent
+    change for the same user.
+
+    Args:
+        user_id (int): User whose favorites changed.
+        added (iterable): Movie IDs that were added.
+        removed (iterable): Movie IDs that were removed.
+    """
+    added, removed = set(added), set(removed)
+    changed = added | removed
+    if not changed:
+        return
+
+    partners = set(FavoriteMovie.objects.filter(user_id=user_id).values_list('movie_id', flat=True)) | changed
+    _refresh_cooccurrences(changed, partners)
+    bump_recommendation_version(user_id)
+    logger.info(f"Applied favorite changes for user {user_id}: +{len(added)} -{len(removed)}")
+
+def get_recommendation_version(user_id):
+    """Return the user's recommendation version, bumped whenever favorites change."""
+    return get_cache_generation(f"recommendations_{user_id}")
+
+def bump_recommendation_version(user_id):
+    """Invalidate the user's cached recommendations by bumping their version."""
+    return bump_cache_generation(f"recommendations_{user_id}")
+
+def reset_user_recommendations(user_id):
+    """Drop the user's cached profile and recommendations, e.g. after bulk-loading favorites."""
+    bump_recommendation_version(user_id)
+
+def get_recommendations(user_id, mode='genre'):
+    """Return cached recommended movie IDs, computing them at most once per version.
+
+    The first caller after a version bump takes a lock and recomputes. While it
+    runs, other callers get the previous result for the user if there is one,
+    flagged as stale so it is not cached as the new version's answer.
+    Genre sampling is seeded with the user and version, so a given version
+    always ranks the same way and can be paged through without repeats.
+
+    Args:
+        user_id (int): User ID.
+        mode (str): 'genre' for genre affinity or 'item' for item-item neighbours.
+
+    Returns:
+        tuple: (up to REC_MAX_RESULTS recommended movie IDs, best first;
+            True if they are the previous version's result).
+    """
+    version = get_recommendation_version(user_id)
+
+    def compute(user_id):
+        if mode == 'item':
+            return recommend_similar_movie_ids(user_id, limit=REC_MAX_RESULTS)
+        return recommend_movie_ids(user_id, limit=REC_MAX_RESULTS, rng=random.Random(f"{user_id}:{version}"))
+
+    key = f"rec_result_{user_id}_{mode}_v{version}"
+    latest_key = f"rec_result_{user_id}_{mode}_latest"
+    result = cache.get(key)
+    if result is not None:
+        return result, False
+
+    if cache.add(f"{key}_lock", 1, timeout=REC_LOCK_TIMEOUT):
+        try:
+            result = compute(user_id)
+            cache.set_many({key: result, latest_key: result}, timeout=REC_RESULT_TIMEOUT)
+            return result, False
+        finally:
+            cache.delete(f"{key}_lock")
+
+    stale = cache.get(latest_key)
+    if stale is not None:
+        logger.info(f"Serving stale recommendations for user {user_id} while they are rebuilt")
+        return stale, True
+    for _ in range(20):
+        time.sleep(0.05)
+        result = cache.get(key)
+        if result is not None:
+            return result, False
+    return compute(user_id), False
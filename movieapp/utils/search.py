@@ -0,0 +1,68 @@
+# movieapp/utils/search.py
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.db import connections
+from django.db.models import F
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import SearchFilter
+from rest_framework.pagination import CursorPagination
+from movieapp.constants import SEARCH_CONFIG
+from movieapp.models import Movie
+
+def is_postgres(using='default'):
+    """Return True if the given database supports full-text and trigram search."""
+    return connections[using].vendor == 'postgresql'
+
+def search_vector_expression():
+    """Weighted document for movies: title matches rank above description matches."""
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+    )
+
+def update_search_vectors(movie_ids):
+    """Recompute the stored search vector of the given movies in one UPDATE.
+
+    A no-op on databases other than PostgreSQL.
+
+    Args:
+        movie_ids (iterable): Movie IDs whose title or description changed.
+    """
+    if not is_postgres():
+        return
+    Movie.objects.filter(id__in=list(movie_ids)).update(search_vector=search_vector_expression())
+
+class MovieSearchFilter(SearchFilter):
+    """Ranked full-text movie search with a trigram fallback for typos.
+
+    On PostgreSQL, ?search= is matched against the stored, GIN-indexed
+    search_vector and ordered by rank. When the view finds that nothing
+    matches, it sets view.search_fallback and filters again, and titles are
+    matched by trigram similarity instead (e.g. 'incepton' finds 'Inception').
+    Other databases fall back to DRF's SearchFilter over the view's search_fields.
+    Cursor pages always follow IDs and would drop the ranking, so searching
+    with cursor pagination is rejected.
+    """
+
+    def can_fall_back(self, request, queryset):
+        """Return True if the request is a search that has a trigram fallback."""
+        return bool(self.get_search_terms(request)) and is_postgres(queryset.db)
+
+    def filter_queryset(self, request, queryset, view):
+        terms = ' '.join(self.get_search_terms(request))
+        if terms and isinstance(getattr(view, 'paginator', None), CursorPagination):
+            raise ValidationError({self.search_param: ["Not supported with cursor pagination, which always orders by ID."]})
+        if not terms or not is_postgres(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        if getattr(view, 'search_fallback', False):
+            return (
+                queryset.filter(title__trigram_similar=terms)
+                .annotate(similarity=TrigramSimilarity('title', terms))
+                .order_by('-similarity', 'id')
+            )
+        query = SearchQuery(terms, config=SEARCH_CONFIG, search_type='websearch')
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(search_rank=SearchRank(F('search_vector'), query))
+            .order_by('-search_rank', 'id')
+        )
@@ -0,0 +1,108 @@
+# movieapp/utils/sync_queue.py
+import json
+import logging
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from movieapp.constants import SYNC_QUEUE_KEY, SYNC_JOB_DEDUPE_TIMEOUT, SYNC_INTERVAL, TMDB_MAX_PAGE
+from movieapp.utils.sync_utils import sync_tmdb_movies
+from movieapp.utils.genre_cache import refresh_genre_map
+from movieapp.utils.recommendation_engine import build_genre_pools
+from movieapp.utils.leaderboard import reconcile_favorite_counts
+
+logger = logging.getLogger(__name__)
+
+def _synced_key(page):
+    """Build the cache key marking a TMDB page as recently synced."""
+    return f"tmdb_page_synced_{page}"
+
+def _sync_page(job):
+    """Sync one TMDB page and mark it as recently synced, even if the sync failed."""
+    try:
+        sync_tmdb_movies(page=job['page'])
+    finally:
+        cache.set(_synced_key(job['page']), 1, timeout=SYNC_INTERVAL)
+
+SYNC_JOB_HANDLERS = {
+    'sync_page': _sync_page,
+    'refresh_genres': lambda job: refresh_genre_map(),
+    'rebuild_rec_pools': lambda job: build_genre_pools(),
+    'reconcile_favorite_counts': lambda job: reconcile_favorite_counts(),
+}
+
+def _pending_key(payload):
+    """Build the cache key marking a job payload as already queued."""
+    return f"sync_job_pending_{payload}"
+
+def enqueue_sync_job(job_type, **params):
+    """Push a job onto the background sync queue.
+
+    Identical jobs are only queued once per SYNC_JOB_DEDUPE_TIMEOUT, whether
+    or not a worker has picked them up yet.
+
+    Args:
+        job_type (str): Key into SYNC_JOB_HANDLERS (e.g., 'sync_page').
+        params: Job parameters (e.g., page=1).
+
+    Returns:
+        bool: True if the job was queued, False if already pending or on error.
+    """
+    payload = json.dumps({'type': job_type, **params}, sort_keys=True)
+    if not cache.add(_pending_key(payload), 1, timeout=SYNC_JOB_DEDUPE_TIMEOUT):
+        return False
+    try:
+        get_redis_connection('default').rpush(SYNC_QUEUE_KEY, payload)
+    except Exception as e:
+        cache.delete(_pending_key(payload))
+        logger.error(f"Failed to enqueue sync job {payload}: {str(e)}")
+        return False
+    logger.info(f"Enqueued sync job {payload}")
+    return True
+
+def dequeue_sync_job(timeout=5):
+    """Block until a sync job is available or the timeout elapses.
+
+    Args:
+        timeout (int): Seconds to wait for a job.
+
+    Returns:
+        dict: Job description or None if the queue stayed empty.
+    """
+    item = get_redis_connection('default').blpop(SYNC_QUEUE_KEY, timeout=timeout)
+    if item is None:
+        return None
+    payload = item[1].decode() if isinstance(item[1], bytes) else item[1]
+    # The pending key is left to expire so a job cannot be queued again while it runs.
+    return json.loads(payload)
+
+def request_page_sync(page):
+    """Queue a TMDB page sync on behalf of a request that found the page missing.
+
+    The page is clamped to the range TMDB serves, and pages synced within the
+    last SYNC_INTERVAL are not queued again, so traffic on a page TMDB cannot
+    fill does not keep the worker syncing and invalidating caches.
+
+    Args:
+        page (int): Requested page number.
+
+    Returns:
+        bool: True if the job was queued.
+    """
+    page = min(max(page, 1), TMDB_MAX_PAGE)
+    if cache.get(_synced_key(page)):
+        return False
+    return enqueue_sync_job('sync_page', page=page)
+
+def run_sync_job(job):
+    """Execute a single sync job with the registered handler.
+
+    Args:
+        job (dict): Job description as returned by dequeue_sync_job.
+    """
+    handler = SYNC_JOB_HANDLERS.get(job.get('type'))
+    if handler is None:
+        logger.warning(f"Unknown sync job type: {job}")
+        return
+    try:
+        handler(job)
+    except Exception as e:
+        logger.error(f"Sync job {job} failed: {str(e)}")
@@ -1,42 +1,160 @@
 import logging
-from django.core.cache import cache
+from collections import defaultdict
+from django.db import transaction
+from django.utils.dateparse import parse_date
+from movieapp.constants import MOVIES_CACHE_NAMESPACE
 from movieapp.models import Movie, Genre
 from movieapp.utils.tmdb_utils import TMDBUtils
+from movieapp.utils.genre_cache import get_genre_map
+from movieapp.utils.cache_utils import bump_cache_generation
+from movieapp.utils.pubsub import publish
+from movieapp.utils.search import update_search_vectors
 
 logger = logging.getLogger(__name__)
 
+MOVIE_UPDATE_FIELDS = ['title', 'description', 'release_date', 'poster_path']
+
+def _build_movie(movie_data):
+    """Build an unsaved Movie instance from a TMDB result row.
+
+    Args:
+        movie_data (dict): Single entry from a TMDB 'results' list.
+
+    Returns:
+        Movie: Unsaved movie instance.
+    """
+    try:
+        release_date = parse_date(movie_data.get('release_date') or '')
+    except ValueError:
+        release_date = None
+    poster_path = movie_data.get('poster_path')
+    return Movie(
+        tmdb_id=movie_data['id'],
+        title=movie_data['title'][:Movie._meta.get_field('title').max_length],
+        description=movie_data.get('overview') or '',
+        release_date=release_date,
+        poster_path=f"https://image.tmdb.org/t/p/w500{poster_path}" if poster_path else None,
+    )
+
+def _changed_movies(rows, movies):
+    """Pick out the movies that are new or differ from their stored row.
+
+    Args:
+        rows (dict): TMDB result dicts keyed by TMDB ID.
+        movies (list): Unsaved movies built from rows, in the same order.
+
+    Returns:
+        list: Movies whose fields or genres differ from the database.
+    """
+    MovieGenre = Movie.genres.through
+    existing = {
+        row['tmdb_id']: row
+        for row in Movie.objects.filter(tmdb_id__in=rows).values('id', 'tmdb_id', *MOVIE_UPDATE_FIELDS)
+    }
+    existing_genres = defaultdict(set)
+    for movie_id, genre_id in MovieGenre.objects.filter(
+        movie_id__in=[row['id'] for row in existing.values()]
+    ).values_list('movie_id', 'genre_id'):
+        existing_genres[movie_id].add(genre_id)
+
+    changed = []
+    for movie in movies:
+        row = existing.get(movie.tmdb_id)
+        if (
+            row is None
+            or any(getattr(movie, field) != row[field] for field in MOVIE_UPDATE_FIELDS)
+            or set(rows[movie.tmdb_id].get('genre_ids', [])) != existing_genres[row['id']]
+        ):
+            changed.append(movie)
+    return changed
+
+def upsert_tmdb_movies(results, genre_map):
+    """Bulk upsert a batch of TMDB movie results and their genres.
+
+    Runs a fixed number of queries regardless of batch size: two reads to find
+    the movies that are new or changed, then for those one genre insert, one
+    movie upsert, one delete and one insert on the movie-genre table, and on
+    PostgreSQL one search vector update, all in a single transaction.
+    Cached movie lists and details are only invalidated, and a 'movies_synced'
+    event only sent to every worker, when something actually changed, so
+    re-syncing an unchanged page leaves the caches warm.
+
+    Args:
+        results (list): TMDB movie result dicts.
+        genre_map (dict): Mapping of TMDB genre IDs to names.
+
+    Returns:
+        list: Primary keys of the movies that were inserted or changed.
+    """
+    rows = {}
+    for movie_data in results:
+        if not movie_data.get('id') or not movie_data.get('title'):
+            logger.warning(f"Skipping TMDB movie without id or title: {movie_data}")
+            continue
+        rows[movie_data['id']] = movie_data
+    if not rows:
+        return []
+
+    MovieGenre = Movie.genres.through
+
+    with transaction.atomic():
+        movies = _changed_movies(rows, [_build_movie(movie_data) for movie_data in rows.values()])
+        if not movies:
+            return []
+        rows = {movie.tmdb_id: rows[movie.tmdb_id] for movie in movies}
+        genre_ids = sorted({genre_id for movie_data in rows.values() for genre_id in movie_data.get('genre_ids', [])})
+        if genre_ids:
+            Genre.objects.bulk_create(
+                [Genre(id=genre_id, name=genre_map.get(genre_id, f"Genre {genre_id}")) for genre_id in genre_ids],
+                ignore_conflicts=True,
+            )
+        Movie.objects.bulk_create(
+            movies,
+            update_conflicts=True,
+            unique_fields=['tmdb_id'],
+            update_fields=MOVIE_UPDATE_FIELDS,
+        )
+        if any(movie.pk is None for movie in movies):
+            id_map = dict(Movie.objects.filter(tmdb_id__in=rows).values_list('tmdb_id', 'id'))
+        else:
+            id_map = {movie.tmdb_id: movie.pk for movie in movies}
+
+        MovieGenre.objects.filter(movie_id__in=id_map.values()).delete()
+        MovieGenre.objects.bulk_create(
+            [
+                MovieGenre(movie_id=id_map[tmdb_id], genre_id=genre_id)
+                for tmdb_id, movie_data in rows.items()
+                for genre_id in set(movie_data.get('genre_ids', []))
+            ],
+            ignore_conflicts=True,
+        )
+        update_search_vectors(id_map.values())
+
+    bump_cache_generation(MOVIES_CACHE_NAMESPACE)
+    # Lets every web worker patch its in-process title index.
+    publish('movies_synced', movies=[[id_map[movie.tmdb_id], movie.title] for movie in movies])
+    return list(id_map.values())
+
 def sync_tmdb_movies(page=1):
     """Sync popular movies from TMDB API to the database.
-    
+
     Args:
         page (int): Page number for paginated TMDB results (default: 1).
+
+    Returns:
+        int: Number of movies inserted or changed.
     """
     logger.info(f"Syncing TMDB movies for page {page}")
     tmdb_data = TMDBUtils.get_popular_movies(page=page)
     if not tmdb_data.get('results'):
         logger.warning(f"No results from TMDB API for page {page}")
-        return
-
-    genre_map = TMDBUtils.get_genre_list()
-    for movie_data in tmdb_data.get('results', []):
-        try:
-            movie, created = Movie.objects.update_or_create(
-                tmdb_id=movie_data.get('id'),
-                defaults={
-                    'title': movie_data.get('title'),
-                    'description': movie_data.get('overview') or '',
-                    'release_date': movie_data.get('release_date') or None,
-                    'poster_path': f"https://image.tmdb.org/t/p/w500{movie_data.get('poster_path')}" if movie_data.get('poster_path') else None,
-                }
-            )
-            genre_ids = movie_data.get('genre_ids', [])
-            if genre_ids:
-                genres = []
-                for genre_id in genre_ids:
-                    genre_name = genre_map.get(genre_id, f"Genre {genre_id}")
-                    genre, _ = Genre.objects.get_or_create(id=genre_id, defaults={'name': genre_name})
-                    genres.append(genre)
-                movie.genres.set(genres)
-            logger.info(f"{'Created' if created else 'Updated'} movie: {movie.title} (TMDB ID: {movie.tmdb_id})")
-        except Exception as e:
-            logger.error(f"Error syncing movie {movie_data.get('title')} (TMDB ID: {movie_data.get('id')}): {str(e)}")
\ No newline at end of file
+        return 0
+
+    genre_map = get_genre_map()
+    try:
+        movie_ids = upsert_tmdb_movies(tmdb_data['results'], genre_map)
+    except Exception as e:
+        logger.error(f"Error syncing TMDB page {page}: {str(e)}")
+        return 0
+    logger.info(f"Upserted {len(movie_ids)} new or changed movies from TMDB page {page}")
+    return len(movie_ids)
@@ -0,0 +1,146 @@
+# movieapp/utils/tiered_cache.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from django.core.cache import cache
+from movieapp.constants import CACHE_LOCAL_TIMEOUT, CACHE_LOCAL_MAX_ENTRIES, CACHE_FILL_WAIT
+from movieapp.utils.pubsub import publish, subscribe, ensure_listener
+
+logger = logging.getLogger(__name__)
+
+class TieredCache:
+    """Bounded in-process LRU/TTL tier (L1) in front of the Django Redis cache (L2).
+
+    Concurrent misses on the same key in one process are coalesced: the first
+    caller fills the key while the others wait for it. Invalidations are
+    broadcast over Redis pub/sub so every worker drops its L1 copy.
+    """
+
+    def __init__(self, max_entries=CACHE_LOCAL_MAX_ENTRIES, local_timeout=CACHE_LOCAL_TIMEOUT):
+        self.max_entries = max_entries
+        self.local_timeout = local_timeout
+        self._entries = OrderedDict()
+        self._fills = {}
+        self._lock = threading.Lock()
+        self._stats = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0}
+
+    def _get_local(self, key):
+        """Return the L1 value for key, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set_local(self, key, value, timeout=None):
+        """Store a value in L1 only, evicting the least recently used entry if full."""
+        local_timeout = min(timeout, self.local_timeout) if timeout else self.local_timeout
+        with self._lock:
+            self._entries[key] = (time.monotonic() + local_timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_local(self, keys):
+        """Drop keys from L1 without touching Redis."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Flush Redis and this process's L1; other workers' L1 copies expire on their own."""
+        cache.clear()
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key):
+        """Return the value from L1, then L2, or None on a miss.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Cached value or None.
+        """
+        ensure_listener()
+        value = self._get_local(key)
+        if value is not None:
+            self._stats['l1_hits'] += 1
+            return value
+        value = cache.get(key)
+        if value is not None:
+            self._stats['l2_hits'] += 1
+            self.set_local(key, value)
+            return value
+        self._stats['misses'] += 1
+        return None
+
+    def set(self, key, value, timeout):
+        """Store a value in both tiers.
+
+        Args:
+            key (str): Cache key.
+            value: Value to cache.
+            timeout (int): L2 timeout in seconds; L1 keeps it for at most local_timeout.
+        """
+        cache.set(key, value, timeout=timeout)
+        self.set_local(key, value, timeout)
+
+    def delete(self, *keys):
+        """Delete keys from Redis and from every worker's L1."""
+        cache.delete_many(keys)
+        self.invalidate(*keys)
+
+    def invalidate(self, *keys):
+        """Drop keys from every worker's L1 after they were changed in Redis."""
+        self.invalidate_local(keys)
+        publish('cache_invalidate', keys=list(keys))
+
+    def begin_fill(self, key):
+        """Claim the right to compute a missing key.
+
+        Args:
+            key (str): Cache key that just missed.
+
+        Returns:
+            bool: True if the caller should compute and then call end_fill;
+                False if another caller filled it (or gave up) while we waited.
+        """
+        with self._lock:
+            event = self._fills.get(key)
+            if event is None:
+                self._fills[key] = threading.Event()
+                return True
+        event.wait(timeout=CACHE_FILL_WAIT)
+        return False
+
+    def end_fill(self, key):
+        """Release waiters blocked in begin_fill for key."""
+        with self._lock:
+            event = self._fills.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def get_metrics(self):
+        """Return hit counters and hit ratios for each tier in this process.
+
+        Returns:
+            dict: Counters plus l1_hit_ratio, l2_hit_ratio and overall hit_ratio.
+        """
+        stats = dict(self._stats)
+        lookups = sum(stats.values())
+        l2_lookups = stats['l2_hits'] + stats['misses']
+        stats['l1_hit_ratio'] = stats['l1_hits'] / lookups if lookups else 0.0
+        stats['l2_hit_ratio'] = stats['l2_hits'] / l2_lookups if l2_lookups else 0.0
+        stats['hit_ratio'] = (stats['l1_hits'] + stats['l2_hits']) / lookups if lookups else 0.0
+        stats['l1_entries'] = len(self._entries)
+        return stats
+
+tiered_cache = TieredCache()
+subscribe('cache_invalidate', lambda event: tiered_cache.invalidate_local(event.get('keys', [])))
@@ -0,0 +1,179 @@
+# movieapp/utils/title_index.py
+import bisect
+import logging
+import re
+import threading
+import time
+import unicodedata
+from django.db import connection
+from movieapp.constants import AUTOCOMPLETE_LIMIT, TITLE_INDEX_RELOAD_INTERVAL
+from movieapp.models import Movie
+from movieapp.utils.pubsub import subscribe, ensure_listener
+
+logger = logging.getLogger(__name__)
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+def normalize_title(text):
+    """Lowercase, strip accents and collapse punctuation so 'Amélie!' matches 'amelie'."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(' ', stripped.casefold()).strip()
+
+def _title_keys(movies):
+    """Build the sorted key lists for (movie_id, title) pairs.
+
+    Each title gets one key per word: the normalized title from that word
+    onwards, so 'knight' and 'dark kn' both find 'The Dark Knight'. Keys
+    starting at the first word go in a separate list so they can rank first.
+
+    Returns:
+        tuple: Sorted (key, movie_id) lists for title starts and later words.
+    """
+    starts, later = [], []
+    for movie_id, title in movies:
+        words = normalize_title(title).split()
+        if words:
+            starts.append((' '.join(words), movie_id))
+        later.extend((' '.join(words[position:]), movie_id) for position in range(1, len(words)))
+    return sorted(starts), sorted(later)
+
+def _remove_keys(keys, removed):
+    """Delete the given keys from a sorted key list in place."""
+    for key in removed:
+        index = bisect.bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            del keys[index]
+
+def _scan(keys, prefix, limit):
+    """Return up to limit movie IDs whose key starts with prefix, in key order."""
+    movie_ids = []
+    for index in range(bisect.bisect_left(keys, (prefix,)), len(keys)):
+        key, movie_id = keys[index]
+        if not key.startswith(prefix) or len(movie_ids) == limit:
+            break
+        movie_ids.append(movie_id)
+    return movie_ids
+
+class TitleIndex:
+    """In-process prefix index over movie titles for type-ahead search.
+
+    Keys live in sorted lists searched with bisect, so a lookup costs
+    O(log n + limit) and never touches the database. The index is loaded
+    once per worker, patched in place from 'movies_synced' and
+    'movies_deleted' pub/sub events and fully reloaded in a background thread
+    every TITLE_INDEX_RELOAD_INTERVAL seconds to catch missed events.
+    """
+
+    def __init__(self):
+        self._state = ([], [], {})  # (start keys, later-word keys, titles by id), guarded by _lock
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self._first_load_lock = threading.Lock()
+
+    def load(self):
+        """Rebuild the index from the Movie table."""
+        titles = dict(Movie.objects.values_list('id', 'title'))
+        starts, later = _title_keys(titles.items())
+        with self._lock:
+            self._state = (starts, later, titles)
+            self._loaded_at = time.monotonic()
+        logger.info(f"Title index loaded: {len(titles)} movies, {len(starts) + len(later)} keys")
+
+    def ensure_loaded(self):
+        """Load the index on first use and keep it from getting older than the reload interval.
+
+        Only the first load blocks. After that, the first request to find the
+        index stale claims the reload and runs it in a background thread, and
+        every request keeps searching the current state meanwhile.
+        """
+        ensure_listener()
+        if self._loaded_at is None:
+            with self._first_load_lock:
+                if self._loaded_at is None:
+                    self.load()
+            return
+        if time.monotonic() - self._loaded_at < TITLE_INDEX_RELOAD_INTERVAL:
+            return
+        with self._lock:
+            if time.monotonic() - self._loaded_at < TITLE_INDEX_RELOAD_INTERVAL:
+                return
+            self._loaded_at = time.monotonic()
+        threading.Thread(target=self._reload, name='title-index-reload', daemon=True).start()
+
+    def _reload(self):
+        """Reload the index off the request path; a failure is retried after the next interval."""
+        try:
+            self.load()
+        except Exception as e:
+            logger.error(f"Title index reload failed: {str(e)}")
+        finally:
+            connection.close()
+
+    def update(self, movies):
+        """Insert or retitle movies without reloading the whole index.
+
+        Only the keys of the given movies are touched: each old key is found
+        and removed with bisect, and each new key inserted in order.
+
+        Args:
+            movies (iterable): (movie_id, title) pairs.
+        """
+        changed = dict(movies)
+        if not changed:
+            return
+        with self._lock:
+            starts, later, titles = self._state
+            for movie_id, title in changed.items():
+                if movie_id in titles:
+                    old_starts, old_later = _title_keys([(movie_id, titles[movie_id])])
+                    _remove_keys(starts, old_starts)
+                    _remove_keys(later, old_later)
+                new_starts, new_later = _title_keys([(movie_id, title)])
+                for key in new_starts:
+                    bisect.insort(starts, key)
+                for key in new_later:
+                    bisect.insort(later, key)
+                titles[movie_id] = title
+
+    def remove(self, movie_ids):
+        """Drop deleted movies from the index.
+
+        Args:
+            movie_ids (iterable): IDs of the deleted movies.
+        """
+        with self._lock:
+            starts, later, titles = self._state
+            for movie_id in movie_ids:
+                if movie_id in titles:
+                    old_starts, old_later = _title_keys([(movie_id, titles.pop(movie_id))])
+                    _remove_keys(starts, old_starts)
+                    _remove_keys(later, old_later)
+
+    def search(self, query, limit=AUTOCOMPLETE_LIMIT):
+        """Return movies whose title has a word starting with query.
+
+        Titles starting with the query come first, then titles with a later
+        word starting with it, each group in alphabetical order.
+
+        Args:
+            query (str): Typed prefix.
+            limit (int): Maximum number of results.
+
+        Returns:
+            list: Dicts with 'id' and 'title'.
+        """
+        prefix = normalize_title(query)
+        if not prefix:
+            return []
+        with self._lock:
+            starts, later, titles = self._state
+            movie_ids = _scan(starts, prefix, limit)
+            if len(movie_ids) < limit:
+                # A title can match on several later words; over-fetch so duplicates don't cut the list short.
+                movie_ids = list(dict.fromkeys(movie_ids + _scan(later, prefix, limit * 2)))[:limit]
+            return [{'id': movie_id, 'title': titles[movie_id]} for movie_id in movie_ids]
+
+title_index = TitleIndex()
+subscribe('movies_synced', lambda event: title_index.update(event.get('movies', [])))
+subscribe('movies_deleted', lambda event: title_index.remove(event.get('movie_ids', [])))
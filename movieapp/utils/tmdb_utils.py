@@ -1,32 +1,142 @@
 # movieapp/utils/tmdb_utils.py
 import logging
+import os
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
-from movieapp.constants import TMDB_BASE_URL
+from movieapp.constants import (
+    TMDB_BASE_URL, TMDB_CONNECT_TIMEOUT, TMDB_READ_TIMEOUT, TMDB_POOL_SIZE,
+    TMDB_MAX_RETRIES, TMDB_BACKOFF_FACTOR, TMDB_CIRCUIT_FAILURE_THRESHOLD,
+    TMDB_CIRCUIT_RESET_TIMEOUT,
+)
 
 logger = logging.getLogger(__name__)
 
+class CircuitOpenError(requests.RequestException):
+    """Raised when TMDB calls are short-circuited after repeated failures."""
+
+class CircuitBreaker:
+    """In-process circuit breaker guarding outbound TMDB calls."""
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """Return True if a call may go out (closed, or half-open after the reset timeout)."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            return time.monotonic() - self.opened_at >= self.reset_timeout
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        """Count a failed call and open the circuit once the threshold is reached."""
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(f"TMDB circuit opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+circuit_breaker = CircuitBreaker(TMDB_CIRCUIT_FAILURE_THRESHOLD, TMDB_CIRCUIT_RESET_TIMEOUT)
+
+def get_session():
+    """Return the keep-alive TMDB session for the current worker process.
+
+    The session is recreated after a fork so gunicorn workers never share
+    pooled sockets with their parent.
+
+    Returns:
+        requests.Session: Pooled session with retry policy mounted.
+    """
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            retry = Retry(
+                total=TMDB_MAX_RETRIES,
+                backoff_factor=TMDB_BACKOFF_FACTOR,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(['GET']),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=TMDB_POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session, _session_pid = session, os.getpid()
+        return _session
+
+def _is_server_failure(exc):
+    """Return True if the error should count against the circuit breaker."""
+    response = getattr(exc, 'response', None)
+    return response is None or response.status_code >= 500 or response.status_code == 429
+
 class TMDBUtils:
     """Utility class for interacting with the TMDB API."""
     BASE_URL = TMDB_BASE_URL
     API_KEY = settings.TMDB_API_KEY
+    TIMEOUT = (TMDB_CONNECT_TIMEOUT, TMDB_READ_TIMEOUT)
+
+    @staticmethod
+    def _get(path, **params):
+        """Perform a GET request against the TMDB API.
+
+        Args:
+            path (str): API path relative to BASE_URL (e.g., '/movie/popular').
+            params: Extra query parameters.
+
+        Returns:
+            dict: Decoded JSON response.
+
+        Raises:
+            requests.RequestException: On network, HTTP or decoding errors, or
+                CircuitOpenError while the circuit is open.
+        """
+        if not circuit_breaker.allow_request():
+            raise CircuitOpenError(f"TMDB circuit open, skipping {path}")
+        try:
+            response = get_session().get(
+                f"{TMDBUtils.BASE_URL}{path}",
+                params={"api_key": TMDBUtils.API_KEY, **params},
+                timeout=TMDBUtils.TIMEOUT,
+            )
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException as e:
+            if _is_server_failure(e):
+                circuit_breaker.record_failure()
+            raise
+        circuit_breaker.record_success()
+        return data
 
     @staticmethod
     def get_popular_movies(page=1):
         """Fetch popular movies from TMDB API for the specified page.
-        
+
         Args:
             page (int): Page number for paginated results (default: 1).
-        
+
         Returns:
             dict: JSON response from TMDB API or {'results': []} on error.
         """
         try:
-            url = f"{TMDBUtils.BASE_URL}/movie/popular"
-            params = {"api_key": TMDBUtils.API_KEY, "page": page}
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            return TMDBUtils._get("/movie/popular", page=page)
         except requests.RequestException as e:
             logger.error(f"TMDB API error (popular movies, page={page}): {str(e)}")
             return {'results': []}
@@ -34,19 +144,15 @@ class TMDBUtils:
     @staticmethod
     def get_movie_details(movie_id):
         """Fetch details for a specific movie by TMDB ID.
-        
+
         Args:
             movie_id (int): TMDB movie ID.
-        
+
         Returns:
             dict: Movie details or empty dict on error.
         """
         try:
-            url = f"{TMDBUtils.BASE_URL}/movie/{movie_id}"
-            params = {"api_key": TMDBUtils.API_KEY}
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            return TMDBUtils._get(f"/movie/{movie_id}")
         except requests.RequestException as e:
             logger.error(f"TMDB API error (movie details, id={movie_id}): {str(e)}")
             return {}
@@ -54,17 +160,13 @@ class TMDBUtils:
     @staticmethod
     def get_genre_list():
         """Fetch the list of movie genres from TMDB API.
-        
+
         Returns:
             dict: Mapping of genre IDs to names or empty dict on error.
         """
         try:
-            url = f"{TMDBUtils.BASE_URL}/genre/movie/list"
-            params = {"api_key": TMDBUtils.API_KEY}
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            genres = response.json().get('genres', [])
+            genres = TMDBUtils._get("/genre/movie/list").get('genres', [])
             return {genre['id']: genre['name'] for genre in genres}
         except requests.RequestException as e:
             logger.error(f"TMDB API error (genre list): {str(e)}")
-            return {}
\ No newline at end of file
+            return {}
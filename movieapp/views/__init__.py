@@ -1,4 +1,5 @@
 from .user_views import UserViewSet, RegisterView
 from .movie_views import MovieViewSet
 from .favorite_movie_views import FavoriteMovieViewSet
+from .recommendation_views import RecommendationView
 from .auth_views import token_obtain_pair, token_refresh
\ No newline at end of file
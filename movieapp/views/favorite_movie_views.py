@@ -1,18 +1,29 @@
 import logging
+from django.db import transaction
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from movieapp.models import FavoriteMovie
-from movieapp.serializers import FavoriteMovieSerializer
+from movieapp.models import FavoriteMovie, Movie, User
+from movieapp.serializers import FavoriteMovieSerializer, FavoriteMovieBulkSerializer
 from movieapp.utils.cache_utils import CacheMixin
-from django.core.cache import cache
+from movieapp.utils.leaderboard import update_favorite_counts
+from movieapp.utils.fast_serializers import favorite_values, serialize_favorite_rows
+from movieapp.utils.pagination import FavoriteMovieCursorPagination, OptionalCursorPaginationMixin
+from movieapp.utils.recommendation_engine import apply_favorite_changes
 from movieapp.constants import PAGE_SIZE  # Updated import
 
 logger = logging.getLogger(__name__)
 
-class FavoriteMovieViewSet(CacheMixin, viewsets.ModelViewSet):
+def lock_user(user):
+    """Lock the user's row until the end of the transaction, serializing their favorite adds."""
+    list(User.objects.select_for_update().filter(pk=user.pk).values_list('pk', flat=True))
+
+class FavoriteMovieViewSet(OptionalCursorPaginationMixin, CacheMixin, viewsets.ModelViewSet):
     """ViewSet for managing user favorite movies."""
     serializer_class = FavoriteMovieSerializer
+    cursor_pagination_class = FavoriteMovieCursorPagination
     permission_classes = [permissions.IsAuthenticated]
+    cache_rendered = True
 
     def get_queryset(self):
         """Get favorite movies for the authenticated user.
@@ -25,13 +36,18 @@ class FavoriteMovieViewSet(CacheMixin, viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Create a new favorite movie for the user and invalidate cache.
         
+        The movie's favorite_count is incremented in the same transaction.
+        
         Args:
             serializer: FavoriteMovieSerializer instance with validated data.
         """
-        instance = serializer.save(user=self.request.user)
-        cache_key = self.get_cache_key(self.request, 'favorite_movie_list', self.request.user.id)
-        cache.delete(cache_key)
-        logger.info(f"Cache invalidated for key: {cache_key} after adding FavoriteMovie id={instance.id}")
+        with transaction.atomic():
+            lock_user(self.request.user)
+            instance = serializer.save(user=self.request.user)
+            update_favorite_counts({instance.movie_id: 1})
+        apply_favorite_changes(self.request.user.id, added=[instance.movie_id])
+        self.invalidate_cache('favorite_movie_list', self.request.user.id)
+        logger.info(f"Favorite list cache invalidated after adding FavoriteMovie id={instance.id}")
 
     def perform_destroy(self, instance):
         """Delete a favorite movie and invalidate cache.
@@ -40,14 +56,19 @@ class FavoriteMovieViewSet(CacheMixin, viewsets.ModelViewSet):
             instance: FavoriteMovie instance to delete.
         """
         instance_id = instance.id
-        instance.delete()
-        cache_key = self.get_cache_key(self.request, 'favorite_movie_list', self.request.user.id)
-        cache.delete(cache_key)
-        logger.info(f"Cache invalidated for key: {cache_key} after deleting FavoriteMovie id={instance_id}")
+        movie_id = instance.movie_id
+        with transaction.atomic():
+            instance.delete()
+            update_favorite_counts({movie_id: -1})
+        apply_favorite_changes(self.request.user.id, removed=[movie_id])
+        self.invalidate_cache('favorite_movie_list', self.request.user.id)
+        logger.info(f"Favorite list cache invalidated after deleting FavoriteMovie id={instance_id}")
 
     def list(self, request, *args, **kwargs):
         """List favorite movies with pagination and caching.
         
+        Pass pagination=cursor for keyset pages ordered by (added_at, id).
+        
         Args:
             request: HTTP request object.
         
@@ -60,24 +81,68 @@ class FavoriteMovieViewSet(CacheMixin, viewsets.ModelViewSet):
             return cached_response
 
         queryset = self.get_queryset()
-        logger.info(f"FavoriteMovie queryset count: {queryset.count()}")
-        if not queryset.exists():
-            empty_response = {'count': 0, 'next': None, 'previous': None, 'results': []}
-            self.cache_response(cache_key, empty_response)
-            return Response(empty_response)
-
         self.paginator.page_size = PAGE_SIZE
-        try:
-            page = self.paginate_queryset(queryset)
-            if page is not None:
-                serializer = self.get_serializer(page, many=True)
-                response = self.get_paginated_response(serializer.data)
-                logger.info(f"FavoriteMovie paginated response: count={response.data['count']}, next={response.data['next']}")
-                self.cache_response(cache_key, response.data)
-                return response
-        except Exception as e:
-            logger.error(f"FavoriteMovie pagination failed: {str(e)}")
+        page = self.paginate_queryset(favorite_values(queryset))
+        response = self.get_paginated_response(serialize_favorite_rows(page))
+        logger.info(f"FavoriteMovie paginated response: count={response.data.get('count')}, next={response.data['next']}")
+        self.cache_response(cache_key, response.data)
+        return response
+
+    @action(detail=False, methods=['post', 'delete'], url_path='bulk', serializer_class=FavoriteMovieBulkSerializer)
+    def bulk(self, request):
+        """Add (POST) or remove (DELETE) several favorite movies in one request.
+
+        Writes are a single bulk insert or a single delete, followed by one
+        favorite count update and one cache invalidation for the whole batch.
+        
+        Args:
+            request: HTTP request object with a 'movie_ids' list.
+        
+        Returns:
+            Response: Per-movie results with status 'added', 'already_favorited'
+                or 'not_found' (POST), or 'removed' or 'not_favorited' (DELETE).
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        movie_ids = list(dict.fromkeys(serializer.validated_data['movie_ids']))
+        user = request.user
+
+        if request.method == 'POST':
+            existing = set(Movie.objects.filter(id__in=movie_ids).values_list('id', flat=True))
+            with transaction.atomic():
+                # Serialize adds per user, so no concurrent insert lands between the read and the write.
+                lock_user(user)
+                favorited = set(
+                    FavoriteMovie.objects.filter(user=user, movie_id__in=movie_ids).values_list('movie_id', flat=True)
+                )
+                added = [movie_id for movie_id in movie_ids if movie_id in existing and movie_id not in favorited]
+                FavoriteMovie.objects.bulk_create([FavoriteMovie(user=user, movie_id=movie_id) for movie_id in added])
+                update_favorite_counts({movie_id: 1 for movie_id in added})
+            apply_favorite_changes(user.id, added=added)
+            changed = added
+            statuses = {movie_id: 'added' for movie_id in added}
+            statuses.update({movie_id: 'already_favorited' for movie_id in favorited})
+            default_status = 'not_found'
+        else:
+            with transaction.atomic():
+                removed = set(
+                    FavoriteMovie.objects.select_for_update()
+                    .filter(user=user, movie_id__in=movie_ids)
+                    .values_list('movie_id', flat=True)
+                )
+                FavoriteMovie.objects.filter(user=user, movie_id__in=removed).delete()
+                update_favorite_counts({movie_id: -1 for movie_id in removed})
+            apply_favorite_changes(user.id, removed=removed)
+            changed = removed
+            statuses = {movie_id: 'removed' for movie_id in removed}
+            default_status = 'not_favorited'
 
-        serializer = self.get_serializer(queryset, many=True)
-        self.cache_response(cache_key, serializer.data)
-        return Response(serializer.data)
\ No newline at end of file
+        if changed:
+            self.invalidate_cache('favorite_movie_list', user.id)
+        logger.info(f"Bulk {request.method} favorites for user {user.id}: {len(movie_ids)} movies")
+        return Response({
+            'results': [
+                {'movie_id': movie_id, 'status': statuses.get(movie_id, default_status)}
+                for movie_id in movie_ids
+            ]
+        })
@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.core.cache import cache
 from movieapp.utils.tmdb_utils import TMDBUtils
+from movieapp.utils.tiered_cache import tiered_cache
 from movieapp.models import Movie
 
 class HealthCheckView(APIView):
@@ -12,7 +13,8 @@ class HealthCheckView(APIView):
         """Check the health of the API components.
         
         Returns:
-            Response: Health status of database, Redis, and TMDB API.
+            Response: Health status of database, Redis, and TMDB API, plus
+                this worker's cache hit ratios.
         """
         try:
             # Check database
@@ -28,6 +30,7 @@ class HealthCheckView(APIView):
                 'database': 'ok',
                 'redis': 'ok' if redis_ok else 'error',
                 'tmdb_api': 'ok' if tmdb_ok else 'error',
+                'cache': tiered_cache.get_metrics(),
             }, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({'status': 'unhealthy', 'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
\ No newline at end of file
@@ -1,26 +1,51 @@
 import logging
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
-from rest_framework.filters import SearchFilter
 from movieapp.models import Movie
 from movieapp.serializers import MovieSerializer
-from movieapp.utils.cache_utils import CacheMixin
-from movieapp.utils.tmdb_utils import TMDBUtils
-from movieapp.utils.sync_utils import sync_tmdb_movies
-from movieapp.constants import PAGE_SIZE  # Updated import
+from movieapp.utils.cache_utils import CacheMixin, bump_cache_generation
+from movieapp.utils.fast_serializers import movie_values, serialize_movie_rows
+from movieapp.utils.pagination import (
+    EstimatedCountPageNumberPagination, MovieCursorPagination, OptionalCursorPaginationMixin,
+)
+from movieapp.utils.sync_queue import enqueue_sync_job, request_page_sync
+from movieapp.utils.leaderboard import get_leaderboard
+from movieapp.utils.search import MovieSearchFilter, update_search_vectors
+from movieapp.utils.movie_filters import MovieFilter
+from movieapp.utils.pubsub import publish
+from movieapp.utils.title_index import title_index
+from movieapp.constants import (
+    PAGE_SIZE, MOVIES_CACHE_NAMESPACE, AUTOCOMPLETE_LIMIT, AUTOCOMPLETE_MAX_LIMIT, LEADERBOARD_LIMIT, LEADERBOARD_MAX_LIMIT,
+)
 
 logger = logging.getLogger(__name__)
 
-class MovieViewSet(CacheMixin, viewsets.ModelViewSet):
+class MovieViewSet(OptionalCursorPaginationMixin, CacheMixin, viewsets.ModelViewSet):
     """ViewSet for managing movie data with TMDB integration."""
     queryset = Movie.objects.all().order_by('id').prefetch_related('genres')
     serializer_class = MovieSerializer
+    pagination_class = EstimatedCountPageNumberPagination
+    cursor_pagination_class = MovieCursorPagination
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [SearchFilter]
+    filter_backends = [MovieSearchFilter, MovieFilter]
     search_fields = ['title', 'description']
+    search_fallback = False  # Set by list() to filter with MovieSearchFilter's trigram fallback
+    cache_rendered = True
 
     def list(self, request, *args, **kwargs):
-        """List movies with pagination, TMDB syncing, and search filtering.
+        """List movies with pagination, search, genre/date filters and sorting.
+
+        Movies are served from the database only; an empty or out-of-range
+        page queues a background TMDB sync instead of blocking on it.
+        Rows are serialized by the fast read-only path, which matches
+        MovieSerializer's output. A miss costs one count, the page query and
+        the genre query; pass pagination=cursor for keyset pages without a
+        count, or count=estimate to estimate it on the unfiltered list. A
+        search with no full-text match at all is answered by the trigram
+        fallback, after one exists() query when the count did not tell.
         
         Args:
             request: HTTP request object.
@@ -28,40 +53,59 @@ class MovieViewSet(CacheMixin, viewsets.ModelViewSet):
         Returns:
             Response: Paginated list of movies or cached response.
         """
-        cache_key = self.get_cache_key(request, 'movie_list')
+        cache_key = self.get_cache_key(request, 'movie_list', namespace=MOVIES_CACHE_NAMESPACE)
         cached_response = self.get_cached_response(cache_key)
         if cached_response:
             return cached_response
 
-        page = int(request.GET.get('page', '1'))
-        sync_tmdb_movies(page=page)
-
-        queryset = self.get_queryset()
-        logger.info(f"Queryset count: {queryset.count()}")
-        if not queryset.exists():
-            logger.warning("Queryset is empty after TMDB sync")
-            empty_response = {'count': 0, 'next': None, 'previous': None, 'results': []}
-            self.cache_response(cache_key, empty_response)
-            return Response(empty_response)
-
+        queryset = self.filter_queryset(self.get_queryset())
         self.paginator.page_size = PAGE_SIZE
+        not_found = None
         try:
-            page = self.paginate_queryset(queryset)
-            if page is not None:
-                serializer = self.get_serializer(page, many=True)
-                response = self.get_paginated_response(serializer.data)
-                logger.info(f"Paginated response: count={response.data['count']}, next={response.data['next']}")
-                self.cache_response(cache_key, response.data)
-                return response
-        except Exception as e:
-            logger.error(f"Pagination failed: {str(e)}")
-
-        serializer = self.get_serializer(queryset, many=True)
-        self.cache_response(cache_key, serializer.data)
-        return Response(serializer.data)
+            page = self.paginate_queryset(movie_values(queryset))
+        except NotFound as e:
+            page, not_found = None, e
+        if not page and MovieSearchFilter().can_fall_back(request, queryset) and not self.has_matches(queryset, page):
+            # Nothing matches the full-text search at all: retry with trigram matching for typos.
+            self.search_fallback = True
+            queryset = self.filter_queryset(self.get_queryset())
+            page = self.paginate_queryset(movie_values(queryset))
+        elif not_found is not None:
+            self.queue_page_sync(request, queryset)
+            raise not_found
+        response = self.get_paginated_response(serialize_movie_rows(page))
+        logger.info(f"Paginated response: count={response.data.get('count')}, next={response.data['next']}")
+        if not page:
+            self.queue_page_sync(request, queryset)
+            # Not cached: the background sync is expected to fill the table shortly.
+            logger.warning("Movie page is empty, waiting for background TMDB sync")
+            return response
+        self.cache_response(cache_key, response.data)
+        return response
+
+    def has_matches(self, queryset, page):
+        """Return True if the filtered queryset has any row, reusing the page count when there is one."""
+        django_page = getattr(self.paginator, 'page', None)
+        if page is not None and hasattr(django_page, 'paginator'):
+            return django_page.paginator.count > 0
+        return queryset.exists()
+
+    def queue_page_sync(self, request, queryset):
+        """Queue a TMDB sync for the requested page of the unfiltered list.
+
+        Searches, filters and cursor pages can come back empty for reasons a
+        sync will not fix, so only plain page-number requests queue one.
+        """
+        if queryset.query.where or not isinstance(self.paginator, PageNumberPagination):
+            return
+        page = request.GET.get(self.paginator.page_query_param, '1')
+        if page.isdigit():
+            request_page_sync(int(page))
 
     def retrieve(self, request, *args, **kwargs):
-        """Retrieve a single movie by ID with TMDB details.
+        """Retrieve a single movie by ID.
+        
+        Served from the database only, so a slow TMDB never holds the request.
         
         Args:
             request: HTTP request object.
@@ -70,13 +114,86 @@ class MovieViewSet(CacheMixin, viewsets.ModelViewSet):
         Returns:
             Response: Movie details or cached response.
         """
-        cache_key = self.get_cache_key(request, 'movie_detail', kwargs.get('pk'))
+        cache_key = self.get_cache_key(request, 'movie_detail', kwargs.get('pk'), namespace=MOVIES_CACHE_NAMESPACE)
         cached_response = self.get_cached_response(cache_key)
         if cached_response:
             return cached_response
 
         instance = self.get_object()
-        tmdb_data = TMDBUtils.get_movie_details(instance.tmdb_id)
         serializer = self.get_serializer(instance)
         self.cache_response(cache_key, serializer.data)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+    def perform_create(self, serializer):
+        """Create the movie, index it for search and autocomplete, and invalidate cached movies."""
+        super().perform_create(serializer)
+        self.movie_written(serializer.instance)
+
+    def perform_update(self, serializer):
+        """Update the movie, re-index it for search and autocomplete, and invalidate cached movies."""
+        super().perform_update(serializer)
+        self.movie_written(serializer.instance)
+
+    def perform_destroy(self, instance):
+        """Delete the movie, drop it from every worker's title index and invalidate cached movies."""
+        movie_id = instance.pk
+        super().perform_destroy(instance)
+        bump_cache_generation(MOVIES_CACHE_NAMESPACE)
+        publish('movies_deleted', movie_ids=[movie_id])
+
+    def movie_written(self, movie):
+        """Propagate a movie created or changed through the API, like a TMDB sync does."""
+        update_search_vectors([movie.pk])
+        bump_cache_generation(MOVIES_CACHE_NAMESPACE)
+        publish('movies_synced', movies=[[movie.pk, movie.title]])
+
+    def get_limit(self, request, default, maximum):
+        """Parse the 'limit' query parameter, capped at maximum.
+        
+        Raises:
+            ValidationError: If limit is not a positive integer.
+        """
+        try:
+            limit = min(int(request.GET.get('limit', default)), maximum)
+        except ValueError:
+            raise ValidationError({'limit': ["A valid integer is required."]})
+        if limit < 1:
+            raise ValidationError({'limit': ["Must be a positive integer."]})
+        return limit
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Suggest movies whose title has a word starting with the typed text.
+
+        Served from the in-process title index, so it never queries the
+        database per keystroke.
+        
+        Args:
+            request: HTTP request object with 'q' and optional 'limit'.
+        
+        Returns:
+            Response: List of {'id', 'title'} suggestions.
+        """
+        limit = self.get_limit(request, AUTOCOMPLETE_LIMIT, AUTOCOMPLETE_MAX_LIMIT)
+        title_index.ensure_loaded()
+        return Response(title_index.search(request.GET.get('q', ''), limit=limit))
+
+    @action(detail=False, methods=['get'])
+    def leaderboard(self, request):
+        """List the most favorited movies.
+
+        Read straight from a Redis sorted set maintained on every favorite
+        change, so it costs O(log n + limit) and no database query. An empty
+        board queues a rebuild for the background worker.
+        
+        Args:
+            request: HTTP request object with optional 'limit'.
+        
+        Returns:
+            Response: List of movies with their favorite_count, most favorited first.
+        """
+        limit = self.get_limit(request, LEADERBOARD_LIMIT, LEADERBOARD_MAX_LIMIT)
+        entries = get_leaderboard(limit)
+        if not entries:
+            enqueue_sync_job('reconcile_favorite_counts')
+        return Response(entries)
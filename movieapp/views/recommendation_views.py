@@ -1,28 +1,44 @@
 # movieapp/views/recommendation_views.py
 from rest_framework.views import APIView
-from rest_framework.response import Response
 from rest_framework import permissions
-from movieapp.models import Movie, FavoriteMovie, Genre
-from movieapp.serializers import MovieSerializer
+from rest_framework.exceptions import ValidationError
+from movieapp.constants import REC_MODES
+from movieapp.utils.cache_utils import CacheMixin
+from movieapp.utils.fast_serializers import serialize_movies_in_order
+from movieapp.utils.pagination import RankedListCursorPagination
+from movieapp.utils.recommendation_engine import get_recommendations
 
-class RecommendationView(APIView):
+class RecommendationView(CacheMixin, APIView):
     """View for recommending movies based on user favorites."""
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = RankedListCursorPagination
+    cache_rendered = True
 
     def get(self, request):
         """Generate movie recommendations for the authenticated user.
+
+        The 'mode' query parameter selects genre affinity ('genre', default) or
+        item-item collaborative filtering ('item'). Results are cached per user
+        until their favorites change and paged with an opaque 'cursor'. Pages
+        carry an ETag and honour If-None-Match.
         
         Returns:
-            Response: List of recommended movies.
+            Response: Cursor-paginated list of recommended movies.
         """
-        user = request.user
-        favorite_genres = Genre.objects.filter(
-            movie__favoritemovie__user=user
-        ).distinct()
-        recommended_movies = Movie.objects.filter(
-            genres__in=favorite_genres
-        ).exclude(
-            favoritemovie__user=user
-        ).order_by('?')[:10]
-        serializer = MovieSerializer(recommended_movies, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        mode = request.GET.get('mode', REC_MODES[0])
+        if mode not in REC_MODES:
+            raise ValidationError({'mode': [f"Must be one of: {', '.join(REC_MODES)}."]})
+        # Same namespace as the recommendation version, so favorite changes invalidate every page.
+        cache_key = self.get_cache_key(request, 'recommendations', request.user.id)
+        cached_response = self.get_cached_response(cache_key)
+        if cached_response:
+            return cached_response
+
+        paginator = self.pagination_class()
+        ranked_ids, is_stale = get_recommendations(request.user.id, mode)
+        movie_ids = paginator.paginate_list(ranked_ids, request)
+        response = paginator.get_paginated_response(serialize_movies_in_order(movie_ids))
+        if not is_stale:
+            # A stale list belongs to the previous version; caching it would outlive the rebuild.
+            self.cache_response(cache_key, response.data)
+        return response
\ No newline at end of file
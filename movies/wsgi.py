@@ -7,6 +7,7 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 """
 
+import logging
 import os
 
 from django.core.wsgi import get_wsgi_application
@@ -14,3 +15,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'movies.settings')
 
 application = get_wsgi_application()
+
+# Build the per-worker autocomplete index up front instead of on the first keystroke.
+from movieapp.utils.title_index import title_index  # noqa: E402
+
+try:
+    title_index.ensure_loaded()
+except Exception as e:
+    logging.getLogger(__name__).warning(f"Title index not loaded at startup: {str(e)}")
@@ -0,0 +1,45 @@
+# scripts/bench/autocomplete.py
+"""Benchmark title index lookups and the /api/movies/autocomplete/ endpoint.
+
+    python scripts/bench/autocomplete.py --movies 10000
+
+Prefixes are random 1-5 character starts of title words, like keystrokes.
+"""
+import argparse
+import random
+from common import TITLE_WORDS, report, seed_catalog, setup_django, test_database, timed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=10000)
+    parser.add_argument('--lookups', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIClient
+    from movieapp.utils.title_index import TitleIndex
+
+    with test_database():
+        seed_catalog(args.movies)
+        index = TitleIndex()
+        load = timed(index.load, 1)[0]
+        starts, later, _ = index._state
+        print(f"Loaded {args.movies} titles ({len(starts) + len(later)} keys) in {load * 1e3:.0f}ms")
+
+        rng = random.Random(0)
+        prefixes = iter([rng.choice(TITLE_WORDS)[:rng.randint(1, 5)] for _ in range(args.lookups + args.requests)])
+        report('TitleIndex.search', timed(lambda: index.search(next(prefixes)), args.lookups), unit=1e6, suffix='us')
+        retitles = iter([(rng.randint(1, args.movies), f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_WORDS)}")
+                         for _ in range(args.lookups)])
+        report('TitleIndex.update, 1 movie', timed(lambda: index.update([next(retitles)]), args.lookups), unit=1e6, suffix='us')
+
+        client = APIClient()
+        client.get('/api/movies/autocomplete/?q=a')  # loads the process-wide index
+        report(
+            'GET /api/movies/autocomplete/',
+            timed(lambda: client.get('/api/movies/autocomplete/', {'q': next(prefixes)}), args.requests),
+        )
+
+if __name__ == '__main__':
+    main()
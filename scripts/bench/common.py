@@ -0,0 +1,161 @@
+# scripts/bench/common.py
+"""Shared setup for the benchmark scripts.
+
+Every script runs against a throwaway test database created from the configured
+DATABASES, the same way `manage.py test` does, so real data is never touched.
+Run them from the project root, e.g. `python scripts/bench/serializers.py`.
+"""
+import datetime
+import os
+import random
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+def setup_django():
+    """Configure Django with the project settings (override with DJANGO_SETTINGS_MODULE)."""
+    sys.path.insert(0, str(ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'movies.settings')
+    import django
+    django.setup()
+
+@contextmanager
+def test_database():
+    """Create a test database for the duration of the block and destroy it afterwards."""
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    cache.clear()
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+def timed(fn, repeat):
+    """Call fn repeat times and return the per-call durations in seconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples (nearest rank)."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def report(label, samples, unit=1e3, suffix='ms'):
+    """Print the p50, p99 and mean of a list of durations."""
+    print(
+        f"{label}: p50 {percentile(samples, 50) * unit:.2f}{suffix}, "
+        f"p99 {percentile(samples, 99) * unit:.2f}{suffix}, "
+        f"mean {statistics.mean(samples) * unit:.2f}{suffix} over {len(samples)} runs"
+    )
+
+GENRE_IDS = (28, 12, 16, 35, 80, 99, 18, 10751, 14, 36, 27, 10402, 9648, 10749, 878, 10770, 53, 10752, 37)
+TITLE_WORDS = (
+    'the', 'last', 'dark', 'night', 'star', 'return', 'lost', 'city', 'love', 'war', 'king', 'shadow',
+    'river', 'ghost', 'iron', 'silent', 'broken', 'golden', 'storm', 'dragon', 'empire', 'secret', 'wild', 'café',
+)
+
+def seed_catalog(movies, users=0, favorites_per_user=0, batch_size=10000, seed=0):
+    """Insert synthetic genres, movies, users and favorites in bulk.
+
+    Movies get one to three genres and generated titles. Favorites are skewed
+    towards low movie IDs, so there are clear "popular" movies, and each
+    movie's favorite_count matches its FavoriteMovie rows.
+
+    Args:
+        movies (int): Number of movies.
+        users (int): Number of users.
+        favorites_per_user (int): Favorites per user (fewer if duplicates were drawn).
+        batch_size (int): Rows per INSERT.
+        seed (int): Random seed.
+
+    Returns:
+        tuple: (movie IDs, user IDs).
+    """
+    from movieapp.models import FavoriteMovie, Genre, Movie, MovieGenre, User
+    rng = random.Random(seed)
+    Genre.objects.bulk_create([Genre(id=genre_id, name=f"Genre {genre_id}") for genre_id in GENRE_IDS], ignore_conflicts=True)
+
+    picks = [
+        {int(movies * rng.random() ** 3) for _ in range(favorites_per_user)}
+        for _ in range(users)
+    ]
+    counts = [0] * movies
+    for user_picks in picks:
+        for index in user_picks:
+            counts[index] += 1
+
+    movie_ids = []
+    for start in range(0, movies, batch_size):
+        batch = Movie.objects.bulk_create([
+            Movie(
+                title=f"{' '.join(rng.choices(TITLE_WORDS, k=rng.randint(1, 4))).title()} {index}",
+                description=' '.join(rng.choices(TITLE_WORDS, k=30)),
+                release_date=datetime.date(1970, 1, 1) + datetime.timedelta(days=rng.randrange(20000)),
+                tmdb_id=index + 1,
+                poster_path=f"https://image.tmdb.org/t/p/w500/{index}.jpg",
+                favorite_count=counts[index],
+            )
+            for index in range(start, min(start + batch_size, movies))
+        ])
+        MovieGenre.objects.bulk_create([
+            MovieGenre(movie_id=movie.id, genre_id=genre_id)
+            for movie in batch
+            for genre_id in rng.sample(GENRE_IDS, rng.randint(1, 3))
+        ], batch_size=batch_size)
+        movie_ids.extend(movie.id for movie in batch)
+
+    user_ids = []
+    for start in range(0, users, batch_size):
+        batch = User.objects.bulk_create([
+            User(username=f"bench{index}", email=f"bench{index}@example.com")
+            for index in range(start, min(start + batch_size, users))
+        ])
+        FavoriteMovie.objects.bulk_create([
+            FavoriteMovie(user_id=user.id, movie_id=movie_ids[movie_index])
+            for offset, user in enumerate(batch)
+            for movie_index in picks[start + offset]
+        ], batch_size=batch_size)
+        user_ids.extend(user.id for user in batch)
+    return movie_ids, user_ids
+
+@contextmanager
+def live_server():
+    """Serve the project over HTTP on a free local port, like LiveServerTestCase.
+
+    Yields:
+        str: Base URL of the server.
+    """
+    from django.db import connections
+    from django.test.testcases import LiveServerThread, _StaticFilesHandler
+    # An in-memory SQLite test database only exists on this connection, so the server shares it.
+    connections_override = {
+        conn.alias: conn for conn in connections.all()
+        if conn.vendor == 'sqlite' and conn.is_in_memory_db()
+    }
+    for conn in connections_override.values():
+        conn.inc_thread_sharing()
+    thread = LiveServerThread('localhost', _StaticFilesHandler, connections_override=connections_override)
+    thread.daemon = True
+    thread.start()
+    thread.is_ready.wait()
+    if thread.error:
+        raise thread.error
+    try:
+        yield f"http://localhost:{thread.port}"
+    finally:
+        thread.terminate()
+        for conn in connections_override.values():
+            conn.dec_thread_sharing()
@@ -0,0 +1,72 @@
+# scripts/bench/load_recommendations.py
+"""Load test /api/recommendations/ with concurrent authenticated users.
+
+    python scripts/bench/load_recommendations.py --concurrency 50 --duration 30
+
+Each simulated user repeatedly fetches the first recommendation page and
+follows its 'next' cursor once, over HTTP against a local server.
+"""
+import argparse
+import threading
+import time
+import requests
+from common import live_server, percentile, seed_catalog, setup_django, test_database
+
+def run_user(base_url, token, deadline, latencies, errors):
+    """Fetch pages 1 and 2 of the user's recommendations until the deadline."""
+    session = requests.Session()
+    session.headers['Authorization'] = f"Bearer {token}"
+    while time.monotonic() < deadline:
+        url = f"{base_url}/api/recommendations/"
+        for _ in range(2):
+            started = time.perf_counter()
+            response = session.get(url)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                break
+            url = response.json()['next']
+            if url is None:
+                break
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=50000)
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--favorites', type=int, default=20, help='Favorites per user')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework_simplejwt.tokens import AccessToken
+    from movieapp.models import User
+    from movieapp.utils.recommendation_engine import build_genre_pools
+
+    with test_database():
+        _, user_ids = seed_catalog(args.movies, max(args.users, args.concurrency), args.favorites)
+        build_genre_pools()
+        tokens = [str(AccessToken.for_user(user)) for user in User.objects.filter(id__in=user_ids[:args.concurrency])]
+
+        with live_server() as base_url:
+            latencies, errors = [], []
+            deadline = time.monotonic() + args.duration
+            threads = [
+                threading.Thread(target=run_user, args=(base_url, token, deadline, latencies, errors))
+                for token in tokens
+            ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+    print(
+        f"{len(threads)} concurrent users, {len(latencies)} requests in {elapsed:.1f}s: "
+        f"{len(latencies) / elapsed:.0f} req/s, p50 {percentile(latencies, 50) * 1e3:.1f}ms, "
+        f"p99 {percentile(latencies, 99) * 1e3:.1f}ms, {len(errors)} errors"
+    )
+
+if __name__ == '__main__':
+    main()
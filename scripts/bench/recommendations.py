@@ -0,0 +1,58 @@
+# scripts/bench/recommendations.py
+"""Benchmark genre-affinity recommendations against the old ORDER BY RANDOM() query.
+
+    python scripts/bench/recommendations.py --movies 1000000 --users 100000
+
+The old query joins every movie sharing a genre with the user's favorites and
+sorts them randomly; the engine samples from cached per-genre pools.
+"""
+import argparse
+import random
+import time
+from common import report, seed_catalog, setup_django, test_database, timed
+
+def old_recommendations(user_id):
+    """The RecommendationView query this engine replaced."""
+    from movieapp.models import Genre, Movie
+    favorite_genres = Genre.objects.filter(movies__favoritemovie__user_id=user_id).distinct()
+    return list(
+        Movie.objects.filter(genres__in=favorite_genres)
+        .exclude(favoritemovie__user_id=user_id)
+        .order_by('?')
+        .values_list('id', flat=True)[:10]
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--favorites', type=int, default=20, help='Favorites per user')
+    parser.add_argument('--samples', type=int, default=200, help='Users to time')
+    parser.add_argument('--old-samples', type=int, default=20, help='Users to time on the old query')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from movieapp.utils.recommendation_engine import build_genre_pools, recommend_movie_ids
+
+    with test_database():
+        started = time.perf_counter()
+        movie_ids, user_ids = seed_catalog(args.movies, args.users, args.favorites)
+        print(f"Seeded {len(movie_ids)} movies and {len(user_ids)} users in {time.perf_counter() - started:.1f}s")
+
+        sample = random.Random(1).sample(user_ids, min(args.samples, len(user_ids)))
+        old_users = iter(sample[:args.old_samples])
+        report('old ORDER BY RANDOM()', timed(lambda: old_recommendations(next(old_users)), min(args.old_samples, len(sample))))
+
+        started = time.perf_counter()
+        build_genre_pools()
+        print(f"Built genre pools in {(time.perf_counter() - started) * 1e3:.0f}ms")
+
+        cold_users = iter(sample)
+        report('engine, cold user profile', timed(lambda: recommend_movie_ids(next(cold_users)), len(sample)))
+        warm_users = iter(sample)
+        report('engine, warm user profile', timed(lambda: recommend_movie_ids(next(warm_users)), len(sample)))
+        cache.clear()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+# scripts/bench/serializers.py
+"""Benchmark MovieSerializer against the fast .values() serialization path.
+
+    python scripts/bench/serializers.py --movies 10000
+
+Both sides include their queries (the genre prefetch or genre map) and are
+checked to render byte-identical JSON.
+"""
+import argparse
+from common import report, seed_catalog, setup_django, test_database, timed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from movieapp.models import Movie
+    from movieapp.serializers import MovieSerializer
+    from movieapp.utils.fast_serializers import movie_values, serialize_movie_rows
+
+    with test_database():
+        seed_catalog(args.movies)
+        queryset = Movie.objects.order_by('id').prefetch_related('genres')
+
+        def drf():
+            return MovieSerializer(queryset.all(), many=True).data
+
+        def fast():
+            return serialize_movie_rows(list(movie_values(queryset.all())))
+
+        render = JSONRenderer().render
+        print(f"byte-identical: {render(drf()) == render(fast())}")
+        for label, serialize in (('MovieSerializer', drf), ('fast path', fast)):
+            samples = timed(serialize, args.repeat)
+            report(label, samples)
+            print(f"  {args.movies / min(samples):.0f} movies/s")
+
+if __name__ == '__main__':
+    main()